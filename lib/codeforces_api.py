@@ -1,5 +1,7 @@
-import requests
+import os
 from typing import List, Dict, Any, Optional
+from lib.http_transport import HttpTransport
+from lib.deadline import request_timeout
 
 
 class CodeforcesAPI:
@@ -14,17 +16,29 @@ class CodeforcesAPI:
     
     def __init__(self):
         """Initialize the CodeforcesAPI class."""
-        pass
+        self.BASE_URL = os.environ.get('CODEFORCES_API_URL', self.BASE_URL)
 
-    def user_info(self, params={}):
+    def user_info(self, params={}, timeout=None):
         url = f"{self.BASE_URL}/user.info"
         data = {}
         try:
-            response = requests.get(url, params=params)
+            response = HttpTransport().session().get(url, params=params, timeout=timeout or request_timeout())
             if response.status_code == 200:
                 data = response.json()
         except Exception as e:
             print(f"Error while fetching ratings: {str(e)}")
         return data
 
+    def user_status(self, params={}, timeout=None):
+        url = f"{self.BASE_URL}/user.status"
+        data = {}
+        try:
+            response = HttpTransport().session().get(url, params=params, timeout=timeout or request_timeout())
+            if response.status_code in (200, 400):
+                # Codeforces reports unknown handles with status FAILED and a comment
+                data = response.json()
+        except Exception as e:
+            print(f"Error while fetching submissions: {str(e)}")
+        return data
+
 
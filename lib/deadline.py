@@ -0,0 +1,46 @@
+import os
+import time
+
+
+class Deadline:
+    """
+    Time budget of a fetch cycle.
+
+    Network calls take their timeout from timeout(), so no single request can
+    outlive the budget, and loops stop scheduling new work once it is expired.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def for_fetch_cycle(cls):
+        """Create the budget from FETCH_DEADLINE_SECONDS."""
+        return cls(float(os.environ.get('FETCH_DEADLINE_SECONDS', 120)))
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, limit: float = None) -> float:
+        """
+        Get the timeout for the next network call.
+
+        Args:
+            limit: Per-request timeout, HTTP_TIMEOUT_SECONDS by default
+
+        Returns:
+            float: The smaller of the per-request timeout and the remaining budget
+        """
+        if limit is None:
+            limit = request_timeout()
+        return min(limit, self.remaining())
+
+
+def request_timeout() -> float:
+    """Per-request timeout from HTTP_TIMEOUT_SECONDS."""
+    return float(os.environ.get('HTTP_TIMEOUT_SECONDS', 20))
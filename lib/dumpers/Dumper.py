@@ -3,6 +3,7 @@ import os
 import logging
 from datetime import datetime
 from lib.renderer.renderer import Renderer
+from lib.dumpers.TrendTracker import TrendTracker
 
 class Dumper:
     """
@@ -17,17 +18,20 @@ class Dumper:
         self.renderer = Renderer(mode='dumper')  # Use 'dumper' mode to get process_dump data
         self.PROJECT_ROOT = os.environ.get('PROJECT_ROOT')
         self.SNAPSHOTS_PATH = os.environ.get('SNAPSHOTS_PATH')
+        self.trend_tracker = TrendTracker()
 
     def prepare(self):
         # Create snapshots directory if it doesn't exist
         if not os.path.exists(self.SNAPSHOTS_PATH):
             os.makedirs(self.SNAPSHOTS_PATH)
             self.logger.info(f"Created snapshots directory: {self.SNAPSHOTS_PATH}")
+        self.trend_tracker.prepare()
     
     def process(self):
         """
         Fetch data from Renderer.process_dump and save it to a CSV file.
         The filename includes the current date and time.
+        The snapshot scores are also recorded by TrendTracker.
         
         Returns:
             str: Path to the created CSV file or None if an error occurred
@@ -44,21 +48,31 @@ class Dumper:
                 self.logger.error("No data to dump")
                 return
             
+            # Add the score of every participant to the dump
+            scores = {
+                handle: round(cf_score + informatics_score)
+                for handle, (cf_score, informatics_score) in self.renderer.compute_scores().items()
+            }
+            
             # Generate filename with current date and time
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            now = datetime.now()
+            timestamp = now.strftime(TrendTracker.TIMESTAMP_FORMAT)
             filename = os.path.join(self.PROJECT_ROOT, f"{self.SNAPSHOTS_PATH}/ratings_{timestamp}.csv")
             
             # Set fieldnames for the CSV based on the process_dump format
-            fieldnames = ['handle', 'name', 'rating', 'solved']
+            fieldnames = ['handle', 'name', 'rating', 'solved', 'score']
             
             # Write to CSV file
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(data.values())  # data.values() contains the dictionaries with participant data
+                # data.values() contains the dictionaries with participant data
+                writer.writerows({**row, 'score': scores.get(handle, 0)} for handle, row in data.items())
             
             self.logger.info(f"Successfully dumped data to {filename}")
             
+            self.trend_tracker.record(scores, now.timestamp())
+            
         except Exception as e:
             self.logger.error(f"Error dumping data: {str(e)}")
             return
\ No newline at end of file
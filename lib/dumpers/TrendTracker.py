@@ -0,0 +1,192 @@
+import os
+import csv
+import json
+import logging
+from datetime import datetime
+from lib.global_data import GlobalData
+from lib.renderer.ScoringEngine import ScoringEngine
+
+
+class TrendTracker:
+    """
+    Class for maintaining running trend aggregates over rating snapshots.
+
+    Each recorded snapshot updates, per handle, a short score history limited
+    to the longest window, the best score ever and the rank movement since the
+    previous snapshot. The derived fields (delta_<N>d for every window in
+    TREND_WINDOWS_DAYS, rank_change, best_score) are stored in GlobalData, so
+    serving them costs nothing at request time. The state is persisted to
+    trends.json in the snapshots directory; without it, prepare() backfills
+    the state once from the existing ratings_*.csv snapshots, which needs the
+    parsed contests to rescore snapshots written before the score column.
+    """
+
+    STATE_FILE = 'trends.json'
+    TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.PROJECT_ROOT = os.environ.get('PROJECT_ROOT', '')
+        self.SNAPSHOTS_PATH = os.environ.get('SNAPSHOTS_PATH')
+        self.WINDOWS_DAYS = [
+            int(days.strip()) for days in os.environ.get('TREND_WINDOWS_DAYS', '7,30').split(',') if days.strip()
+        ]
+        self.handles = {}
+        self.last_timestamp = None
+        self.loaded = False  # State loaded or backfilled, only then it may be saved
+
+    @property
+    def snapshots_dir(self):
+        return os.path.join(self.PROJECT_ROOT, self.SNAPSHOTS_PATH)
+
+    @property
+    def state_path(self):
+        return os.path.join(self.snapshots_dir, self.STATE_FILE)
+
+    def prepare(self):
+        """
+        Load the persisted state or backfill it from the existing snapshots.
+
+        Returns:
+            bool: True if preparation was successful, False otherwise
+        """
+        try:
+            if not self.SNAPSHOTS_PATH:
+                self.logger.error("SNAPSHOTS_PATH is not set")
+                return False
+
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self.handles = state['handles']
+                self.last_timestamp = state['last_timestamp']
+            else:
+                if not sum(GlobalData().get_informatics_common_data()):
+                    self.logger.warning("Problem counts are not parsed yet, postponing the trends backfill")
+                    return False
+                self.backfill()
+                self.save()
+
+            self.loaded = True
+            GlobalData().update_trends(self.fields())
+            return True
+        except Exception as e:
+            self.logger.error(f"Error preparing trend tracker: {str(e)}")
+            return False
+
+    def backfill(self):
+        """Replay all ratings_*.csv snapshots in chronological order."""
+        if not os.path.isdir(self.snapshots_dir):
+            return
+
+        snapshots = sorted(
+            filename for filename in os.listdir(self.snapshots_dir)
+            if filename.startswith('ratings_') and filename.endswith('.csv')
+        )
+        # Old snapshots have no score column, rescore them with the current formula
+        scoring = ScoringEngine().compile(
+            GlobalData().get_informatics_contest_ids(), GlobalData().get_informatics_common_data()
+        )
+
+        for filename in snapshots:
+            try:
+                timestamp = datetime.strptime(filename[len('ratings_'):-len('.csv')], self.TIMESTAMP_FORMAT).timestamp()
+                scores = {}
+                with open(os.path.join(self.snapshots_dir, filename), 'r', encoding='utf-8') as csvfile:
+                    for row in csv.DictReader(csvfile):
+                        if row.get('score'):
+                            scores[row['handle']] = float(row['score'])
+                        else:
+                            scores[row['handle']] = round(scoring.evaluate_total(float(row['rating'] or 0), float(row['solved'] or 0)))
+                self.update(scores, timestamp)
+            except Exception as e:
+                self.logger.error(f"Error backfilling trends from {filename}: {str(e)}")
+
+        self.logger.info(f"Backfilled trends from {len(snapshots)} snapshots")
+
+    def update(self, scores, timestamp):
+        """
+        Fold one snapshot into the running aggregates.
+
+        Args:
+            scores (dict): Dictionary mapping handles to scores
+            timestamp (float): Snapshot time as a UNIX timestamp
+        """
+        ordered = sorted(scores.values(), reverse=True)
+        # Competition ranking: equal scores share the best rank
+        ranks = {}
+        for position, score in enumerate(ordered, start=1):
+            ranks.setdefault(score, position)
+
+        horizon = timestamp - max(self.WINDOWS_DAYS, default=0) * 86400
+        for handle, score in scores.items():
+            state = self.handles.setdefault(handle, {'history': [], 'best': score, 'rank': None, 'prev_rank': None})
+            state['history'].append([timestamp, score])
+            # Keep the window and one entry before it as the baseline
+            while len(state['history']) > 1 and state['history'][1][0] <= horizon:
+                state['history'].pop(0)
+            state['best'] = max(state['best'], score)
+            state['prev_rank'] = state['rank']
+            state['rank'] = ranks[score]
+
+        self.last_timestamp = timestamp
+
+    def record(self, scores, timestamp=None):
+        """
+        Record a new snapshot, publish the updated fields and persist the state.
+        The snapshot is skipped while the state cannot be loaded or backfilled,
+        so a partial state never replaces the backfill.
+
+        Args:
+            scores (dict): Dictionary mapping handles to scores
+            timestamp (float): Snapshot time, now by default
+        """
+        if not self.loaded and not self.prepare():
+            self.logger.warning("Trends are not loaded yet, the snapshot is not recorded")
+            return
+
+        timestamp = timestamp if timestamp is not None else datetime.now().timestamp()
+        # A backfill run just now may already contain the snapshot file of this dump
+        if self.last_timestamp is not None and int(timestamp) <= self.last_timestamp:
+            GlobalData().update_trends(self.fields())
+            return
+        self.update(scores, timestamp)
+        GlobalData().update_trends(self.fields())
+        self.save()
+
+    def fields(self):
+        """
+        Derive the extra full-mode fields from the aggregates.
+
+        Returns:
+            dict: Dictionary mapping handles to trend fields
+        """
+        result = {}
+        for handle, state in self.handles.items():
+            history = state['history']
+            current_time, current_score = history[-1]
+            fields = {}
+            for days in self.WINDOWS_DAYS:
+                start = current_time - days * 86400
+                # Latest entry at or before the window start, or the oldest one inside the window
+                baseline = history[0][1]
+                for entry_time, entry_score in history:
+                    if entry_time > start:
+                        break
+                    baseline = entry_score
+                fields[f'delta_{days}d'] = round(current_score - baseline)
+            fields['rank_change'] = state['prev_rank'] - state['rank'] if state['prev_rank'] is not None else 0
+            fields['best_score'] = round(state['best'])
+            result[handle] = fields
+        return result
+
+    def save(self):
+        """Persist the state atomically."""
+        try:
+            os.makedirs(self.snapshots_dir, exist_ok=True)
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'handles': self.handles, 'last_timestamp': self.last_timestamp}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error saving trends: {str(e)}")
@@ -0,0 +1,142 @@
+import io
+import os
+import csv
+import json
+import logging
+from lib.global_data import GlobalData
+from lib.renderer.ScoringEngine import ScoringEngine
+
+
+class Exporter:
+    """
+    Class for streaming the merged in-memory dataset in NDJSON, CSV or Arrow IPC format.
+
+    Participants are scored and encoded in chunks of EXPORT_CHUNK_SIZE rows, so the
+    response body is never built in memory as a whole. Arrow export requires pyarrow.
+    """
+
+    FORMATS = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv; charset=utf-8',
+        'arrow': 'application/vnd.apache.arrow.stream',
+    }
+
+    def __init__(self, format='ndjson'):
+        self.logger = logging.getLogger(__name__)
+        self.format = format
+        self.chunk_size = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+        self.users = []
+        self.informatics_data = {}
+        self.contest_ids = []
+        self.scoring = None
+
+    @property
+    def media_type(self):
+        return self.FORMATS[self.format]
+
+    def prepare(self):
+        """
+        Take a consistent view of GlobalData for the export.
+
+        Returns:
+            bool: True if preparation was successful, False otherwise
+        """
+        if self.format not in self.FORMATS:
+            self.logger.error(f"Unknown export format: {self.format}")
+            return False
+        if self.format == 'arrow':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                self.logger.error("Arrow export requires pyarrow")
+                return False
+
+        self.users = list(GlobalData().get_users_data().items())
+        self.informatics_data = GlobalData().get_informatics_data()
+        self.contest_ids = list(GlobalData().get_informatics_contest_ids())
+        self.scoring = ScoringEngine().compile(self.contest_ids, GlobalData().get_informatics_common_data())
+        return True
+
+    def chunks(self):
+        """
+        Yield lists of export rows, one chunk at a time.
+        """
+        for start in range(0, len(self.users), self.chunk_size):
+            chunk = self.users[start:start + self.chunk_size]
+            solves = [self.informatics_data.get(data.get("name", ""), []) for _, data in chunk]
+            scores = self.scoring.evaluate_all([data.get("rating", 0) for _, data in chunk], solves)
+            rows = []
+            for (handle, data), solved, (cf_score, informatics_score) in zip(chunk, solves, scores):
+                rows.append({
+                    'handle': handle,
+                    'name': data.get("name", ""),
+                    'rating': data.get("rating", 0),
+                    'solved': sum(solved),
+                    'solves': dict(zip(self.contest_ids, solved)),
+                    'cf_score': round(cf_score, 1),
+                    'informatics_score': round(informatics_score, 1),
+                    'score': round(cf_score + informatics_score),
+                })
+            yield rows
+
+    def flat_row(self, row):
+        flat = {key: value for key, value in row.items() if key != 'solves'}
+        for contest_id in self.contest_ids:
+            flat[f'solved_{contest_id}'] = row['solves'].get(contest_id, 0)
+        return flat
+
+    @property
+    def flat_fieldnames(self):
+        return (
+            ['handle', 'name', 'rating', 'solved']
+            + [f'solved_{contest_id}' for contest_id in self.contest_ids]
+            + ['cf_score', 'informatics_score', 'score']
+        )
+
+    def iter_ndjson(self):
+        for rows in self.chunks():
+            yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+
+    def iter_csv(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.flat_fieldnames)
+        writer.writeheader()
+        for rows in self.chunks():
+            writer.writerows(self.flat_row(row) for row in rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    def iter_arrow(self):
+        import pyarrow as pa
+
+        fields = [pa.field('handle', pa.string()), pa.field('name', pa.string()), pa.field('rating', pa.int64()), pa.field('solved', pa.int64())]
+        fields += [pa.field(f'solved_{contest_id}', pa.int64()) for contest_id in self.contest_ids]
+        fields += [pa.field('cf_score', pa.float64()), pa.field('informatics_score', pa.float64()), pa.field('score', pa.int64())]
+        schema = pa.schema(fields)
+
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for rows in self.chunks():
+                flat = [self.flat_row(row) for row in rows]
+                writer.write_batch(pa.RecordBatch.from_pylist(flat, schema=schema))
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        # End-of-stream marker written on close
+        yield sink.getvalue()
+
+    def process(self):
+        """
+        Get the streaming body in the requested format.
+
+        Returns:
+            iterator: Iterator over encoded chunks
+        """
+        if self.format == 'csv':
+            return self.iter_csv()
+        if self.format == 'arrow':
+            return self.iter_arrow()
+        return self.iter_ndjson()
@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import logging
+
+
+class InformaticsFetchScheduler(object):
+    """
+    Adaptive per-contest fetch schedule for InformaticsFetcher.
+
+    A contest whose standings changed on the last fetch is polled every
+    FETCH_INTERVAL_MINUTES. Each fetch without changes doubles its interval up
+    to FETCH_MAX_INTERVAL_MINUTES. A contest without changes for
+    FETCH_FREEZE_AFTER_HOURS is frozen: it is not fetched anymore and the
+    stored standings file is used as is.
+
+    The schedule is persisted next to the contest files so that restarts do
+    not reset the back-off and freezing.
+    """
+
+    STATE_FILE = 'fetch_schedule.json'
+
+    def __init__(self, save_dir) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.save_dir = save_dir
+        self.state_path = os.path.join(save_dir, self.STATE_FILE)
+        self.state = {}
+        self.base_interval = int(os.environ.get('FETCH_INTERVAL_MINUTES', 5)) * 60
+        self.max_interval = int(os.environ.get('FETCH_MAX_INTERVAL_MINUTES', 24 * 60)) * 60
+        self.freeze_after = float(os.environ.get('FETCH_FREEZE_AFTER_HOURS', 14 * 24)) * 3600
+        # Scheduler jobs do not fire at exact intervals, allow some slack
+        self.slack = 30
+
+    def load(self):
+        """Load the persisted schedule if there is one."""
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading fetch schedule: {str(e)}")
+            self.state = {}
+        return self
+
+    def save(self):
+        """Persist the schedule atomically."""
+        try:
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error saving fetch schedule: {str(e)}")
+
+    def is_due(self, contest_id, now=None, stored=True) -> bool:
+        """
+        Check whether a contest should be fetched now.
+
+        Args:
+            contest_id (str): Contest ID
+            now (float): Current timestamp
+            stored (bool): Whether the contest file exists on disk
+
+        Returns:
+            bool: True if the contest has to be fetched
+        """
+        now = time.time() if now is None else now
+        entry = self.state.get(contest_id)
+        if entry is None or not stored:
+            return True
+        if entry.get('frozen'):
+            return False
+        return now + self.slack >= entry['fetched_at'] + entry['interval']
+
+    def record(self, contest_id, digest, now=None):
+        """
+        Record a successful fetch and update the contest interval.
+
+        Args:
+            contest_id (str): Contest ID
+            digest (str): Hash of the fetched standings
+            now (float): Current timestamp
+
+        Returns:
+            bool: True if the standings changed since the previous fetch
+        """
+        now = time.time() if now is None else now
+        entry = self.state.get(contest_id)
+        changed = entry is None or entry.get('hash') != digest
+
+        if changed:
+            entry = {'hash': digest, 'changed_at': now, 'interval': self.base_interval, 'frozen': False}
+        else:
+            entry['interval'] = min(entry['interval'] * 2, self.max_interval)
+            if now - entry['changed_at'] >= self.freeze_after:
+                entry['frozen'] = True
+                self.logger.info(f"Контест {contest_id} не менялся {self.freeze_after / 3600:.0f} ч., заморожен")
+
+        entry['fetched_at'] = now
+        self.state[contest_id] = entry
+        return changed
+
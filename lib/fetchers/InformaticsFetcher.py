@@ -3,12 +3,15 @@ import pathlib
 import logging
 from dotenv import load_dotenv
 from lib.global_data import GlobalData
+from lib.deadline import Deadline
+from lib.streaming import stream_to_file
 from lib.fetchers.InformaticsSessionReanimator import InformaticsSessionReanimator
+from lib.fetchers.InformaticsFetchScheduler import InformaticsFetchScheduler
 
 
 class InformaticsFetcher(object):
     def __init__(self) -> None:
-        self.url = 'https://informatics.msk.ru/'
+        self.url = os.environ.get('INFORMATICS_URL', 'https://informatics.msk.ru/')
         self.login_url = self.url + 'login/index.php'
         self.standings_url = self.url + 'py/monitor?contest_id={}'
         self.logger = logging.getLogger(__name__)
@@ -41,9 +44,57 @@ class InformaticsFetcher(object):
             self.logger.error(f"Error in prepare: {str(e)}")
             return False
 
-    def process(self):
-        """Load and save contests data
+    def fetch_single(self, contest_id, file_path, schedule, deadline):
+        """Stream a single contest to disk and keep it if the standings changed
+
+        Returns:
+            dict: Dictionary with 'status', 'size', 'sha1' and 'changed' of the fetched page,
+                  or None if the contest could not be fetched
         """
+        self.logger.info(f"Загрузка результатов для контеста {contest_id}...")
+        tmp_path = file_path.with_name(file_path.name + '.part')
+        try:
+            # Получаем страницу с результатами
+            with GlobalData().get_informatics_session().get(
+                self.standings_url.format(contest_id), timeout=deadline.timeout(), stream=True
+            ) as response:
+                if response.status_code != 200:
+                    self.logger.info(f"Ошибка при получении результатов для контеста {contest_id}. Статус: {response.status_code}")
+                    return None
+                
+                # Пишем страницу во временный файл по частям
+                meta = stream_to_file(response, tmp_path, deadline, response.encoding or 'utf-8')
+                meta['status'] = response.status_code
+            
+            # Заменяем файл только если результаты изменились
+            meta['changed'] = schedule.record(contest_id, meta['sha1']) or not file_path.exists()
+            if meta['changed']:
+                os.replace(tmp_path, file_path)
+                self.logger.info(f"Результаты для контеста {contest_id} сохранены в {file_path} ({meta['size']} байт)")
+            else:
+                self.logger.info(f"Результаты для контеста {contest_id} не изменились")
+            return meta
+            
+        except Exception as e:
+            self.logger.info(f"Ошибка при обработке контеста {contest_id}: {str(e)}")
+            return None
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def process(self, deadline=None):
+        """Load and save data of the contests that are due according to InformaticsFetchScheduler
+
+        Contests are fetched within the deadline of the cycle. Failed contests are retried
+        up to FETCH_RETRIES times while the budget lasts, the rest keep their previously
+        stored standings and are marked stale in GlobalData.
+
+        Returns:
+            dict: Dictionary mapping fetched contest IDs to page metadata from fetch_single()
+        """
+        deadline = deadline or Deadline.for_fetch_cycle()
+        retries = int(os.environ.get('FETCH_RETRIES', 2))
+        
         # Получаем список ID контестов из переменной окружения
         contest_ids_str = os.environ.get('INFORMATICS_CONTEST_IDS')
 
@@ -53,27 +104,33 @@ class InformaticsFetcher(object):
         save_dir = pathlib.Path(os.path.join(self.PROJECT_ROOT, self.INFORMATICS_DIR))
         save_dir.mkdir(parents=True, exist_ok=True)
         
+        schedule = InformaticsFetchScheduler(save_dir).load()
         results = {}
         
-        for contest_id in contest_ids:
-            self.logger.info(f"Загрузка результатов для контеста {contest_id}...")
-            try:
-                # Получаем страницу с результатами
-                response = GlobalData().get_informatics_session().get(self.standings_url.format(contest_id))
-                
-                if response.status_code != 200:
-                    self.logger.info(f"Ошибка при получении результатов для контеста {contest_id}. Статус: {response.status_code}")
+        pending = [
+            contest_id for contest_id in contest_ids
+            if schedule.is_due(contest_id, stored=(save_dir / f"contest_{contest_id}").exists())
+        ]
+        
+        for attempt in range(retries + 1):
+            failed = []
+            for contest_id in pending:
+                if deadline.expired:
+                    failed.append(contest_id)
                     continue
-                
-                # Сохраняем HTML-ответ в файл
-                file_path = save_dir / f"contest_{contest_id}"
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(response.text)
-                
-                self.logger.info(f"Результаты для контеста {contest_id} сохранены в {file_path}")
-                results[contest_id] = response
-                
-            except Exception as e:
-                self.logger.info(f"Ошибка при обработке контеста {contest_id}: {str(e)}")
+                meta = self.fetch_single(contest_id, save_dir / f"contest_{contest_id}", schedule, deadline)
+                if meta is not None:
+                    results[contest_id] = meta
+                else:
+                    failed.append(contest_id)
+            pending = failed
+            if not pending or deadline.expired or attempt == retries:
+                break
+            self.logger.info(f"Повторная загрузка контестов {pending}, попытка {attempt + 2}")
+        
+        if pending:
+            self.logger.warning(f"Контесты {pending} не загружены, используются сохраненные результаты")
+        GlobalData().update_stale_contests(pending)
         
+        schedule.save()
         return results
@@ -1,14 +1,15 @@
-import cloudscraper
 from bs4 import BeautifulSoup
 import os
 import logging
 from dotenv import load_dotenv
 from lib.global_data import GlobalData
+from lib.http_transport import HttpTransport
+from lib.deadline import request_timeout
 
 
 class InformaticsSessionReanimator(object):
     def __init__(self) -> None:
-        self.url = 'https://informatics.msk.ru/'
+        self.url = os.environ.get('INFORMATICS_URL', 'https://informatics.msk.ru/')
         self.login_url = self.url + 'login/index.php'
         self.logger = logging.getLogger(__name__)
         self.username = None
@@ -42,18 +43,13 @@ class InformaticsSessionReanimator(object):
         """
             
         try:
-            # Create a new session
-            session = cloudscraper.create_scraper(
-                browser={
-                    'browser': 'chrome',
-                    'platform': 'windows',
-                    'desktop': True
-                }
-            )
+            # Log in on a new session sharing the pooled connections, the current
+            # session stays in use by the fetchers until this login succeeds
+            session = HttpTransport().scraper()
             
             # Get the login page
             self.logger.info("Получение страницы логина...")
-            form = session.get(self.login_url)
+            form = session.get(self.login_url, timeout=request_timeout())
             
             # Check response status
             if form.status_code != 200:
@@ -92,7 +88,7 @@ class InformaticsSessionReanimator(object):
                     login_data[input_field.attrs['name']] = input_field.attrs['value']
 
             # Send authentication request
-            res = session.post(login_url, data=login_data)
+            res = session.post(login_url, data=login_data, timeout=request_timeout())
             
             # Check if login was successful
             login_successful = 'Вы зашли под именем' in res.text
@@ -1,7 +1,9 @@
 import os
-import requests
 import logging
 from dotenv import load_dotenv
+from lib.http_transport import HttpTransport
+from lib.deadline import Deadline
+from lib.streaming import stream_to_file
 
 
 class UsersFetcher():
@@ -16,37 +18,49 @@ class UsersFetcher():
         return True
 
 
-    def process(self):
+    def process(self, deadline=None):
         """
         Downloads data from a Google Spreadsheet and saves it as a CSV file.
         
-        The function downloads data from the specified Google Spreadsheet and
-        saves it to the path specified in USERS_CSV_PATH environment variable.
+        The function streams data from the specified Google Spreadsheet to
+        the path specified in USERS_CSV_PATH environment variable.
+        The request timeout is limited by the deadline of the fetch cycle.
         
         Returns:
-            bool: True if download was successful, False otherwise
+            dict: Dictionary with 'status', 'size' and 'sha1' of the downloaded file,
+                  empty if download failed
         """
         
+        deadline = deadline or Deadline.for_fetch_cycle()
+        if deadline.expired:
+            self.logger.warning("Fetch cycle deadline expired, keeping the previous CSV file")
+            return {}
+        
+        output_path = os.path.join(self.PROJECT_ROOT, self.USERS_CSV_PATH)
+        tmp_path = output_path + '.part'
         try:
-            # Download the CSV content
-            response = requests.get(self.USERS_SPREADSHEET_URL)
-            
-            # Check if the request was successful
-            if response.status_code == 200:
-                # Create the 'raw' directory if it doesn't exist
-                csv_dir = os.path.dirname(os.path.join(self.PROJECT_ROOT, self.USERS_CSV_PATH))
-                os.makedirs(csv_dir, exist_ok=True)
+            # Stream the CSV content
+            with HttpTransport().session().get(
+                self.USERS_SPREADSHEET_URL, timeout=deadline.timeout(), stream=True
+            ) as response:
+                # Check if the request was successful
+                if response.status_code != 200:
+                    self.logger.error(f"Failed to download the CSV file. Status code: {response.status_code}")
+                    return {}
                 
-                # Save the content to the specified file
-                output_path = os.path.join(self.PROJECT_ROOT, self.USERS_CSV_PATH)
-                with open(output_path, "wb") as f:
-                    f.write(response.content)
+                # Create the 'raw' directory if it doesn't exist
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 
-                self.logger.info(f"CSV file successfully downloaded and saved to {output_path}")
-                return True
-            else:
-                self.logger.error(f"Failed to download the CSV file. Status code: {response.status_code}")
-                return False
+                # Save the content to a temporary file and replace the previous one
+                meta = stream_to_file(response, tmp_path, deadline)
+                meta['status'] = response.status_code
+            os.replace(tmp_path, output_path)
+            
+            self.logger.info(f"CSV file successfully downloaded and saved to {output_path} ({meta['size']} bytes)")
+            return meta
         except Exception as e:
             self.logger.error(f"Error downloading CSV file: {str(e)}")
-            return False
+            return {}
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,4 +1,9 @@
+import os
+import time
 import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
 
 class GlobalData:
     """
@@ -8,19 +13,76 @@ class GlobalData:
     - users_data: Dictionary mapping handles to dictionaries with name and rating from UsersParser
     - informatics_data: Dictionary mapping participant names to lists of solved problems from InformaticsParser
     - informatics_common_data: List containing the number of problems in each contest
+    - informatics_contest_ids: List of contest IDs in the order of informatics_data lists
+    - informatics_bitsets: SolveBitsets with per-problem solve bitsets from InformaticsParser
+    - codeforces_solved: Dictionary mapping handles to solved Codeforces problem counts from CodeforcesSubmissionsParser
+    - trends: Dictionary mapping handles to trend fields maintained by TrendTracker
+    - stale_contests: List of contest IDs that were not fetched within the last fetch cycle
+    - informatics_parse_cache: Dictionary mapping contest IDs to (file signature, solve masks, problem labels)
+    - published_ratings: Dictionary mapping handles to the last published full-mode entries
+    - ratings_version: Monotonically increasing version of published_ratings, starting at the
+      process startup time in milliseconds, so versions from a previous process are always older
+      than the history of the current one and are answered with the full leaderboard
+    - ratings_history: Bounded ring buffer of (version, diff) pairs for the last publishes
+    - ratings_stats: Cohort statistics computed by StatsPublisher for the published version
+    
+    Inside GlobalData.sandbox() the current thread gets a private copy instead.
     """
     _instance = None
+    _sandbox = threading.local()
     
     def __new__(cls):
+        sandbox = getattr(cls._sandbox, 'instance', None)
+        if sandbox is not None:
+            return sandbox
         if cls._instance is None:
             cls._instance = super(GlobalData, cls).__new__(cls)
             cls._instance.users_data = {}
             cls._instance.informatics_data = {}
             cls._instance.informatics_common_data = []
+            cls._instance.informatics_contest_ids = []
+            cls._instance.informatics_bitsets = None
+            cls._instance.codeforces_solved = {}
+            cls._instance.trends = {}
+            cls._instance.stale_contests = []
+            cls._instance.informatics_parse_cache = {}
+            cls._instance.published_ratings = {}
+            cls._instance.ratings_version = int(time.time() * 1000)
+            cls._instance.ratings_history = deque(maxlen=int(os.environ.get('RATINGS_HISTORY_SIZE', 100)))
+            cls._instance.ratings_lock = threading.Lock()
+            cls._instance.ratings_stats = {}
+            cls._instance.ratings_stats_source = None
             cls._instance.informatics_session = None
             cls._instance.logger = logging.getLogger(__name__)
         return cls._instance
     
+    @classmethod
+    @contextmanager
+    def sandbox(cls):
+        """
+        Give the current thread a private copy of the global data.
+        
+        Parsers and renderers run inside the block read the current data and
+        write into the copy, so the published data is never touched. The copy
+        starts with an empty parse cache.
+        
+        Yields:
+            GlobalData: The private copy
+        """
+        source = cls()
+        previous = getattr(cls._sandbox, 'instance', None)
+        copy = object.__new__(cls)
+        copy.__dict__.update(source.__dict__)
+        copy.informatics_parse_cache = {}
+        copy.ratings_history = deque(source.ratings_history, maxlen=source.ratings_history.maxlen)
+        copy.ratings_lock = threading.Lock()
+        copy.logger = logging.getLogger(f"{__name__}.sandbox")
+        cls._sandbox.instance = copy
+        try:
+            yield copy
+        finally:
+            cls._sandbox.instance = previous
+    
     def update_users_data(self, data):
         """
         Update the users data.
@@ -63,6 +125,82 @@ class GlobalData:
         self.informatics_common_data = data
         self.logger.info(f"Updated informatics common data with {len(data)} contests")
     
+    def update_informatics_contest_ids(self, contest_ids):
+        """
+        Update the informatics contest IDs.
+        
+        Args:
+            contest_ids (list): Contest IDs in the order of informatics_data lists
+        """
+        if not isinstance(contest_ids, list):
+            self.logger.error("Invalid informatics contest IDs format. Expected list.")
+            return
+            
+        self.informatics_contest_ids = contest_ids
+    
+    def update_informatics_bitsets(self, bitsets):
+        """
+        Update the informatics solve bitsets.
+        
+        Args:
+            bitsets (SolveBitsets): Per-problem solve bitsets over all parsed participants
+        """
+        self.informatics_bitsets = bitsets
+        self.logger.info(f"Updated informatics bitsets for {len(bitsets.participants)} participants")
+    
+    def update_published_ratings(self, data, diff):
+        """
+        Publish a new leaderboard state under the next version.
+        
+        Args:
+            data (dict): Dictionary mapping handles to full-mode entries
+            diff (dict): Dictionary with 'added' and 'changed' entries and 'removed' handles
+                         relative to the previously published state
+        
+        Returns:
+            int: The version of the published state
+        """
+        if not isinstance(data, dict):
+            self.logger.error("Invalid published ratings format. Expected dictionary.")
+            return self.ratings_version
+            
+        with self.ratings_lock:
+            self.ratings_version += 1
+            self.published_ratings = data
+            self.ratings_history.append((self.ratings_version, diff))
+        self.logger.info(f"Published ratings version {self.ratings_version} with {len(data)} entries")
+        return self.ratings_version
+    
+    def update_ratings_stats(self, stats, source):
+        """
+        Update the cohort statistics.
+        
+        Args:
+            stats (dict): Statistics of the published leaderboard
+            source (tuple): Identity of the data the statistics were computed from
+        """
+        self.ratings_stats = stats
+        self.ratings_stats_source = source
+        self.logger.info(f"Updated ratings stats for version {stats.get('version')}")
+    
+    def get_ratings_stats(self):
+        """
+        Get the cohort statistics.
+        
+        Returns:
+            dict: Statistics of the published leaderboard, empty if nothing was published yet
+        """
+        return self.ratings_stats
+    
+    def get_ratings_stats_source(self):
+        """
+        Get the identity of the data the cohort statistics were computed from.
+        
+        Returns:
+            tuple: (published version, id of the solve bitsets) or None
+        """
+        return self.ratings_stats_source
+    
     def get_users_data(self):
         """
         Get the users data.
@@ -90,6 +228,146 @@ class GlobalData:
         """
         return self.informatics_common_data
         
+    def get_informatics_contest_ids(self):
+        """
+        Get the informatics contest IDs.
+        
+        Returns:
+            list: Contest IDs in the order of informatics_data lists
+        """
+        return self.informatics_contest_ids
+    
+    def get_informatics_bitsets(self):
+        """
+        Get the informatics solve bitsets.
+        
+        Returns:
+            SolveBitsets: Per-problem solve bitsets or None if nothing was parsed yet
+        """
+        return self.informatics_bitsets
+        
+    def update_codeforces_solved(self, data):
+        """
+        Update the solved Codeforces problem counts.
+        
+        Args:
+            data (dict): Dictionary mapping handles to solved problem counts
+        """
+        if not isinstance(data, dict):
+            self.logger.error("Invalid Codeforces solved data format. Expected dictionary.")
+            return
+            
+        self.codeforces_solved = data
+        self.logger.info(f"Updated Codeforces solved counts for {len(data)} handles")
+    
+    def get_codeforces_solved(self):
+        """
+        Get the solved Codeforces problem counts.
+        
+        Returns:
+            dict: Dictionary mapping handles to solved problem counts
+        """
+        return self.codeforces_solved
+        
+    def update_trends(self, data):
+        """
+        Update the trend fields.
+        
+        Args:
+            data (dict): Dictionary mapping handles to dictionaries with score deltas, rank change and best score
+        """
+        if not isinstance(data, dict):
+            self.logger.error("Invalid trends format. Expected dictionary.")
+            return
+            
+        self.trends = data
+        self.logger.info(f"Updated trends for {len(data)} handles")
+    
+    def get_trends(self):
+        """
+        Get the trend fields.
+        
+        Returns:
+            dict: Dictionary mapping handles to dictionaries with score deltas, rank change and best score
+        """
+        return self.trends
+    
+    def update_stale_contests(self, contest_ids):
+        """
+        Update the contests that missed the last fetch cycle.
+        
+        Args:
+            contest_ids (list): Contest IDs served from previously stored standings
+        """
+        self.stale_contests = list(contest_ids)
+        if self.stale_contests:
+            self.logger.info(f"Marked {len(self.stale_contests)} contests as stale")
+    
+    def get_stale_contests(self):
+        """
+        Get the contests that missed the last fetch cycle.
+        
+        Returns:
+            list: Contest IDs served from previously stored standings
+        """
+        return self.stale_contests
+    
+    def get_informatics_parse_cache(self):
+        """
+        Get the cache of parsed contest files.
+        
+        Returns:
+            dict: Dictionary mapping contest IDs to (file signature, solve masks, problem labels)
+        """
+        return self.informatics_parse_cache
+    
+    def get_published_ratings(self):
+        """
+        Get the last published leaderboard.
+        
+        Returns:
+            tuple: (int: version, dict: Dictionary mapping handles to full-mode entries)
+        """
+        with self.ratings_lock:
+            return self.ratings_version, self.published_ratings
+    
+    def get_ratings_since(self, version):
+        """
+        Get the entries that were added, changed or removed after a version.
+        
+        Args:
+            version (int): Version the client already has
+        
+        Returns:
+            dict: Dictionary with the current 'version', 'added' and 'changed' entries
+                  and 'removed' handles, or None if the version is unknown or has
+                  aged out of the history buffer
+        """
+        with self.ratings_lock:
+            current = self.published_ratings
+            if version > self.ratings_version or version < self.ratings_version - len(self.ratings_history):
+                return None
+            
+            # Remember for every touched handle whether it existed at the requested version
+            existed = {}
+            for diff_version, diff in self.ratings_history:
+                if diff_version <= version:
+                    continue
+                for handle in diff['added']:
+                    existed.setdefault(handle, False)
+                for handle in diff['changed']:
+                    existed.setdefault(handle, True)
+                for handle in diff['removed']:
+                    existed.setdefault(handle, True)
+            
+            result = {'version': self.ratings_version, 'added': {}, 'changed': {}, 'removed': []}
+            for handle, was_present in existed.items():
+                if handle in current:
+                    result['changed' if was_present else 'added'][handle] = current[handle]
+                elif was_present:
+                    result['removed'].append(handle)
+            return result
+        
     def set_informatics_session(self, session):
         """
         Set the informatics session.
@@ -0,0 +1,202 @@
+import os
+import time
+import logging
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from cachecontrol import CacheControlAdapter
+from cachecontrol.caches import FileCache
+from lib.replay.HttpRecorder import HttpRecorder
+
+
+class HostLimiter:
+    """
+    Per-host concurrency and rate limit.
+
+    At most `concurrency` requests to the host are sent at once, and request
+    starts are spaced by at least `interval` seconds.
+    """
+
+    def __init__(self, concurrency, interval):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        if self.interval > 0:
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start)
+                self.next_start = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        self.semaphore.release()
+
+
+class LimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that sends through the HostLimiter of the request host."""
+
+    def __init__(self, *args, transport=None, **kwargs):
+        self.transport = transport
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        with self.transport.limiter(urlsplit(request.url).hostname or ''):
+            return super().send(request, *args, **kwargs)
+
+
+class CachingLimitedAdapter(CacheControlAdapter, LimitedAdapter):
+    """
+    Adapter that answers from the HTTP cache first and only sends the
+    remaining requests, including conditional revalidations, through the host limits.
+    """
+
+
+def scraper_adapter_classes():
+    """
+    Adapter classes for cloudscraper sessions, which keep the TLS cipher suite
+    of cloudscraper's CipherSuiteAdapter.
+    """
+    from cloudscraper import CipherSuiteAdapter
+
+    class LimitedCipherSuiteAdapter(LimitedAdapter, CipherSuiteAdapter):
+        pass
+
+    class CachingLimitedCipherSuiteAdapter(CacheControlAdapter, LimitedAdapter, CipherSuiteAdapter):
+        pass
+
+    return LimitedCipherSuiteAdapter, CachingLimitedCipherSuiteAdapter
+
+
+class HttpTransport:
+    """
+    Singleton owning the outbound HTTP sessions of all fetchers.
+
+    - Keep-alive connection pools per host are reused across cycles. Every
+      informatics login gets a new cloudscraper session with its own cookie
+      jar, mounted on the same pooled adapter, so a login never disturbs the
+      session that fetchers are using.
+    - Per-host concurrency and rate limits come from HTTP_HOST_LIMITS, e.g.
+      "codeforces.com=1/2,informatics.msk.ru=4/0" (concurrency/seconds between
+      request starts); other hosts get HTTP_HOST_CONCURRENCY and no interval.
+    - Responses are cached on disk in HTTP_CACHE_DIR following the HTTP caching
+      rules (Cache-Control freshness, ETag and Last-Modified revalidation), so
+      repeated requests for unchanged resources are answered locally or with a 304.
+      Set HTTP_CACHE_DIR to an empty value to disable the cache.
+    """
+    _instance = None
+
+    DEFAULT_HOST_LIMITS = {
+        # Codeforces API allows one call per two seconds
+        'codeforces.com': (1, 2.0),
+    }
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HttpTransport, cls).__new__(cls)
+            cls._instance.logger = logging.getLogger(__name__)
+            cls._instance.lock = threading.Lock()
+            cls._instance.limiters = {}
+            cls._instance.host_limits = cls._parse_host_limits(os.environ.get('HTTP_HOST_LIMITS', ''))
+            cls._instance.default_concurrency = int(os.environ.get('HTTP_HOST_CONCURRENCY', 4))
+            cls._instance.cache = cls._instance._create_cache()
+            cls._instance.plain_session = None
+            cls._instance.scraper_adapter = None
+        return cls._instance
+
+    @classmethod
+    def _parse_host_limits(cls, value):
+        limits = dict(cls.DEFAULT_HOST_LIMITS)
+        for item in value.split(','):
+            if not item.strip():
+                continue
+            host, _, limit = item.strip().partition('=')
+            concurrency, _, interval = limit.partition('/')
+            limits[host] = (int(concurrency or 1), float(interval or 0))
+        return limits
+
+    def _create_cache(self):
+        cache_dir = os.environ.get('HTTP_CACHE_DIR', 'raw/http_cache')
+        if not cache_dir:
+            return None
+        return FileCache(os.path.join(os.environ.get('PROJECT_ROOT', ''), cache_dir))
+
+    def limiter(self, host):
+        """Get the HostLimiter of a host, matching parent domains of the configured hosts."""
+        limiter = self.limiters.get(host)
+        if limiter is not None:
+            return limiter
+        with self.lock:
+            if host not in self.limiters:
+                concurrency, interval = self.default_concurrency, 0.0
+                for configured, limit in self.host_limits.items():
+                    if host == configured or host.endswith('.' + configured):
+                        concurrency, interval = limit
+                        break
+                self.limiters[host] = HostLimiter(concurrency, interval)
+            return self.limiters[host]
+
+    def _adapter(self, limited_class=LimitedAdapter, caching_class=CachingLimitedAdapter, **adapter_kwargs):
+        adapter_kwargs['transport'] = self
+        adapter_kwargs['pool_maxsize'] = max(self.default_concurrency, *(limit[0] for limit in self.host_limits.values()))
+        if self.cache is not None:
+            return caching_class(cache=self.cache, **adapter_kwargs)
+        return limited_class(**adapter_kwargs)
+
+    def _mount(self, session, adapter):
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        HttpRecorder().attach(session)
+        return session
+
+    def session(self):
+        """
+        Get the shared requests session for plain HTTP APIs.
+
+        Returns:
+            requests.Session: Session with pooling, host limits and the HTTP cache
+        """
+        with self.lock:
+            if self.plain_session is None:
+                self.plain_session = self._mount(requests.Session(), self._adapter())
+            return self.plain_session
+
+    def scraper(self):
+        """
+        Create a cloudscraper session for an informatics login.
+
+        The session has a fresh cookie jar and shares the pooled adapter of all
+        previous informatics sessions, so logging in does not touch the cookies
+        of the session currently used for fetching.
+
+        Returns:
+            cloudscraper.CloudScraper: Session with pooling, host limits and the HTTP cache
+        """
+        import cloudscraper
+
+        session = cloudscraper.create_scraper(
+            browser={
+                'browser': 'chrome',
+                'platform': 'windows',
+                'desktop': True
+            }
+        )
+        with self.lock:
+            if self.scraper_adapter is None:
+                cipher_adapter = session.adapters['https://']
+                limited_class, caching_class = scraper_adapter_classes()
+                self.scraper_adapter = self._adapter(
+                    limited_class, caching_class,
+                    ssl_context=cipher_adapter.ssl_context,
+                    cipherSuite=cipher_adapter.cipherSuite,
+                    ecdhCurve=cipher_adapter.ecdhCurve,
+                    server_hostname=cipher_adapter.server_hostname,
+                    source_address=cipher_adapter.source_address,
+                )
+            return self._mount(session, self.scraper_adapter)
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import logging
+from typing import Dict, List, Optional, Set
+from lib.global_data import GlobalData
+from lib.codeforces_api import CodeforcesAPI
+from lib.deadline import Deadline
+
+
+class CodeforcesSubmissionsParser:
+    """
+    Class for incremental ingestion of Codeforces submissions.
+
+    For every handle from UsersParser a compact state is kept: the ID up to
+    which all submissions are final and ingested, the set of solved problems
+    ("contestId/index") and the time of the last update. A handle without
+    state is backfilled with its whole user.status history. After that
+    user.status is paged with from/count (newest submissions first) only until
+    a page reaches the stored ID, so an update costs one small request per
+    handle plus one per CF_STATUS_PAGE_SIZE new submissions. Submissions still
+    being judged keep the stored ID below them, so they are read again until
+    they get a verdict.
+
+    The state is persisted to CF_SUBMISSIONS_STATE (relative to PROJECT_ROOT).
+    Handles are processed least recently updated first, so handles that do
+    not fit into the deadline are the first ones on the next run.
+    """
+
+    # Verdicts of submissions that are still being judged
+    NON_FINAL_VERDICTS = {None, 'TESTING'}
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.PROJECT_ROOT = None
+        self.state_path = None
+        self.page_size = 100
+        self.backfill_page_size = 1000
+        self.state = {}
+
+    def prepare(self):
+        """
+        Load environment variables and the persisted state.
+
+        Returns:
+            bool: True if preparation was successful, False otherwise
+        """
+        try:
+            self.PROJECT_ROOT = os.environ.get('PROJECT_ROOT', os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+            self.state_path = os.path.join(
+                self.PROJECT_ROOT, os.environ.get('CF_SUBMISSIONS_STATE', 'raw/codeforces_submissions.json')
+            )
+            self.page_size = int(os.environ.get('CF_STATUS_PAGE_SIZE', 100))
+            self.backfill_page_size = int(os.environ.get('CF_STATUS_BACKFILL_PAGE_SIZE', 1000))
+
+            self.state = {}
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error preparing CodeforcesSubmissionsParser: {str(e)}")
+            self.state = {}
+            return False
+
+    @staticmethod
+    def problem_key(problem: Dict) -> Optional[str]:
+        """Key of a problem, None for problems without a contest (e.g. acmsguru)."""
+        contest_id = problem.get('contestId')
+        index = problem.get('index')
+        if contest_id is None or index is None:
+            return None
+        return f"{contest_id}/{index}"
+
+    def fetch_new_submissions(self, requester: CodeforcesAPI, handle: str, last_id: int, deadline: Deadline) -> Optional[List[Dict]]:
+        """
+        Page user.status from the newest submission down to last_id.
+
+        Args:
+            requester: Codeforces API client
+            handle: Codeforces handle
+            last_id: ID up to which submissions are already ingested, 0 to backfill
+            deadline: Time budget of the run
+
+        Returns:
+            list: Submissions newer than last_id, or None if a page could not be fetched
+        """
+        count = self.page_size if last_id else self.backfill_page_size
+        submissions = []
+        start = 1
+        while True:
+            if deadline.expired:
+                return None
+            data = requester.user_status({'handle': handle, 'from': start, 'count': count}, timeout=deadline.timeout())
+            if data.get('status') != 'OK':
+                self.logger.warning(f"user.status failed for {handle}: {data.get('comment', 'no response')}")
+                return None
+
+            page = data['result']
+            for submission in page:
+                if submission['id'] <= last_id:
+                    return submissions
+                submissions.append(submission)
+            if len(page) < count:
+                return submissions
+            start += count
+
+    def update_handle(self, requester: CodeforcesAPI, handle: str, deadline: Deadline) -> bool:
+        """
+        Ingest the new submissions of a handle into its state.
+
+        Returns:
+            bool: True if the handle state is up to date
+        """
+        entry = self.state.get(handle, {'last_id': 0, 'solved': []})
+        submissions = self.fetch_new_submissions(requester, handle, entry['last_id'], deadline)
+        if submissions is None:
+            return False
+
+        solved: Set[str] = set(entry['solved'])
+        pending = []
+        for submission in submissions:
+            if submission.get('verdict') in self.NON_FINAL_VERDICTS:
+                pending.append(submission['id'])
+            elif submission['verdict'] == 'OK':
+                key = self.problem_key(submission.get('problem', {}))
+                if key is not None:
+                    solved.add(key)
+
+        if pending:
+            # Stop below the oldest judging submission to read it again next time
+            last_id = min(pending) - 1
+        else:
+            last_id = max([entry['last_id']] + [submission['id'] for submission in submissions])
+
+        self.state[handle] = {
+            'last_id': last_id,
+            'solved': sorted(solved),
+            'updated_at': time.time(),
+        }
+        return True
+
+    def save(self):
+        """Persist the state atomically."""
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error saving Codeforces submissions state: {str(e)}")
+
+    def process(self, deadline: Optional[Deadline] = None):
+        """
+        Update the solved problems of all handles from GlobalData users data
+        and store the solved counts in GlobalData.
+
+        Args:
+            deadline (Deadline): Time budget, FETCH_DEADLINE_SECONDS by default
+
+        Returns:
+            dict: Dictionary mapping handles to the number of solved Codeforces problems
+        """
+        deadline = deadline or Deadline.for_fetch_cycle()
+        try:
+            handles = list(GlobalData().get_users_data())
+            if not handles:
+                # The roster is not loaded, keep the state for when it is
+                self.logger.warning("No users data available, skipping Codeforces submissions")
+                return {}
+
+            # Forget the handles that left the roster
+            self.state = {handle: entry for handle, entry in self.state.items() if handle in handles}
+
+            # Least recently updated first, new handles before everybody else
+            handles.sort(key=lambda handle: self.state.get(handle, {}).get('updated_at', 0))
+
+            requester = CodeforcesAPI()
+            pending = [handle for handle in handles if not self.update_handle(requester, handle, deadline)]
+            if pending:
+                self.logger.warning(f"Codeforces submissions not updated for {len(pending)} handles, continuing next run")
+            self.save()
+
+            solved_counts = {handle: len(entry['solved']) for handle, entry in self.state.items()}
+            GlobalData().update_codeforces_solved(solved_counts)
+            return solved_counts
+        except Exception as e:
+            self.logger.error(f"Error processing Codeforces submissions: {str(e)}")
+            return {}
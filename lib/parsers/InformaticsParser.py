@@ -1,10 +1,21 @@
 import os
+import re
+import html
 import logging
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from lib.global_data import GlobalData
-from typing import Dict, Tuple
-from lib.data import InfromaticsNameConvert
+from typing import Dict, List, Optional, Set, Tuple
+from lib.data import InfromaticsNameConvert, informatics_name_convert
+from lib.solve_bitsets import SolveBitsets
+
+# A participant row of the standings table: position cell, then the name cell with the link to
+# the submissions, then the rest of the row up to its closing tag without crossing into another row
+PARTICIPANT_ROW = re.compile(
+    r'<tr\b[^>]*>\s*<td[^>]*>[^<]*</td>\s*<td[^>]*>\s*<a href="/submits/view\.php\?user_id=\d+"[^>]*>([^<]*)</a>'
+    r'[^<]*(?:<(?!/?tr\b)[^<]*)*</tr>',
+    re.IGNORECASE,
+)
 
 class InformaticsParser():
     def __init__(self):
@@ -12,7 +23,9 @@ class InformaticsParser():
         self.PROJECT_ROOT = None
         self.INFORMATICS_DIR = None
         self.CONTEST_IDS = []
-        self.BANNED_NAMES = []
+        self.BANNED_NAMES = set()
+        self.ROSTER_NAMES = None  # Names as they appear in the tables, None to keep everybody
+        self.roster_signature = None
 
     def prepare(self):
         """
@@ -31,7 +44,11 @@ class InformaticsParser():
             self.CONTEST_IDS = [id.strip() for id in contest_ids_str.split(',') if id.strip()]
 
             banned_names_str = os.environ.get('BANNED_NAMES')
-            self.BANNED_NAMES = [name.strip() for name in banned_names_str.split(',') if name.strip()]
+            self.BANNED_NAMES = {name.strip() for name in banned_names_str.split(',') if name.strip()}
+            
+            # Keep only the roster from UsersParser, or everybody if it is not loaded
+            self.ROSTER_NAMES = self.roster_keys(data.get("name", "") for data in GlobalData().get_users_data().values())
+            self.roster_signature = hash(frozenset(self.ROSTER_NAMES)) if self.ROSTER_NAMES is not None else None
             
             self.logger.info(f"Using Informatics directory: {self.INFORMATICS_DIR}")
             self.logger.info(f"Contest IDs to process: {self.CONTEST_IDS}")
@@ -40,18 +57,56 @@ class InformaticsParser():
             self.logger.error(f"Error preparing InformaticsParser: {str(e)}")
             return False
 
-    def process_single(self, id) -> Tuple[Dict[str, int], int]:
+    @staticmethod
+    def roster_keys(names) -> Optional[Set[str]]:
         """
-        Parse a single contest file and return a dictionary with participant names and their number of solved problems,
-        along with the total number of problems in the contest.
+        Get the table names that join to the roster names.
+        
+        Args:
+            names: Roster names, already converted by InfromaticsNameConvert
+            
+        Returns:
+            set: Names as they appear in the standings tables, or None if the roster is empty
+        """
+        roster = {name for name in names if name}
+        if not roster:
+            return None
+        return roster | {raw for raw, converted in informatics_name_convert.items() if converted in roster}
+
+    def is_wanted(self, name) -> bool:
+        """Check whether a table name is kept: not banned and on the roster, if the roster is loaded."""
+        return name not in self.BANNED_NAMES and (self.ROSTER_NAMES is None or name in self.ROSTER_NAMES)
+
+    def filter_rows(self, content) -> str:
+        """
+        Cut the rows of unwanted participants out of the page before it is parsed,
+        so the parse tree holds only the cohort. Rows in an unexpected format are kept
+        and checked again while scanning the table.
+        """
+        if self.ROSTER_NAMES is None and not self.BANNED_NAMES:
+            return content
+        parts = []
+        last = 0
+        for match in PARTICIPANT_ROW.finditer(content):
+            if self.is_wanted(html.unescape(match.group(1)).strip()):
+                continue
+            parts.append(content[last:match.start()])
+            last = match.end()
+        parts.append(content[last:])
+        return ''.join(parts)
+
+    def process_single(self, id) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Parse a single contest file and return a dictionary with participant names and bitmasks of their solved problems,
+        along with the labels of the problems in the contest. Rows of banned and non-roster names are skipped.
         
         Args:
             id (str): Contest ID
             
         Returns:
             tuple: (
-                dict: Dictionary with participant names as keys and number of pluses as values,
-                int: Number of problems in the contest
+                dict: Dictionary with participant names as keys and solve masks as values (bit i is set if problem i is solved),
+                list: Problem labels in column order
             )
         """
         # Construct the file path
@@ -59,33 +114,32 @@ class InformaticsParser():
         
         # Dictionary to store results
         results = {}
-        problem_count = 0
+        problem_labels = []
         
         try:
             # Check if the file exists
             if not os.path.exists(file_path):
                 self.logger.error(f"Contest file not found at {file_path}")
-                return {}, 0
+                return {}, []
             
             # Read the file content
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
             
-            # Parse HTML content
-            soup = BeautifulSoup(content, 'html.parser')
+            # Parse HTML content of the wanted rows only
+            soup = BeautifulSoup(self.filter_rows(content), 'html.parser')
             
             # Find the main table with results
             table = soup.find('table', {'class': 'BlueTable'})
             if not table:
                 self.logger.error(f"No results table found in contest {id}")
-                return {}, 0
+                return {}, []
             
-            # Find the header row to count problems
+            # Find the header row to collect problem labels
             header_row = table.find('tr')
             if header_row:
-                # Count the number of problem columns (excluding N, Name, and Sum columns)
-                problem_columns = header_row.find_all('td')[3:]
-                problem_count = len(problem_columns)
+                # Problem columns follow the N, Name, and Sum columns
+                problem_labels = [cell.text.strip() for cell in header_row.find_all('td')[3:]]
             
             # Find all participant rows (skip header rows)
             rows = table.find_all('tr')
@@ -96,38 +150,61 @@ class InformaticsParser():
                     continue
                 
                 # Extract participant name
-                name_cell = row.find_all('td')[1]
-                name_link = name_cell.find('a')
+                name_cell = first_cell.find_next_sibling('td')
+                name_link = name_cell.find('a') if name_cell else None
                 if not name_link:
                     continue
                 
                 name = name_link.text.strip()
 
-                if name in self.BANNED_NAMES:
+                # Drop banned and non-roster rows before looking at their results
+                if not self.is_wanted(name):
                     continue
                 
-                # Count pluses (solved problems)
-                pluses = 0
+                # Build the solve mask (bit i for problem i)
+                mask = 0
                 problem_cells = row.find_all('td')[3:]  # Skip position, name, and sum cells
                 
-                for cell in problem_cells:
+                for i, cell in enumerate(problem_cells):
                     cell_text = cell.text.strip()
                     # Count as solved if the cell contains a plus sign
                     if '+' in cell_text:
-                        pluses += 1
+                        mask |= 1 << i
                 
                 # Add to results
-                results[name] = pluses
+                results[name] = mask
             
-            self.logger.info(f"Parsed contest {id} with {len(results)} participants and {problem_count} problems")
-            return results, problem_count
+            self.logger.info(f"Parsed contest {id} with {len(results)} participants and {len(problem_labels)} problems")
+            return results, problem_labels
         except Exception as e:
             self.logger.error(f"Error parsing contest {id}: {str(e)}")
-            return {}, 0
+            return {}, []
+
+    def process_cached(self, id) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Same as process_single(), but reuses the previous result while the contest file and the roster are unchanged.
+        Frozen and unchanged contests are not rewritten by InformaticsFetcher, so they are parsed only once.
+        """
+        file_path = os.path.join(self.PROJECT_ROOT, self.INFORMATICS_DIR, f'contest_{id}')
+        try:
+            stat = os.stat(file_path)
+            signature = (stat.st_mtime_ns, stat.st_size, self.roster_signature)
+        except OSError:
+            return self.process_single(id)
+        
+        cached = GlobalData().get_informatics_parse_cache().get(id)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+        
+        results, problem_labels = self.process_single(id)
+        if problem_labels:
+            GlobalData().get_informatics_parse_cache()[id] = (signature, results, problem_labels)
+        return results, problem_labels
 
     def process(self):
         """
         Process all contests specified in INFORMATICS_CONTEST_IDS environment variable.
+        Only roster participants are kept when the users data is loaded.
         Also updates the GlobalData instance with the parsed data.
         
         Returns:
@@ -143,18 +220,20 @@ class InformaticsParser():
         # Dictionary to store all participants across all contests
         all_participants = set()
         
-        # Dictionary to store results for each contest
+        # Dictionary to store solve masks for each contest
         contest_results = {}
         
-        # List to store the number of problems in each contest
+        # Problem labels and the number of problems in each contest
+        contest_problem_labels = {}
         contest_problem_counts = []
         
         # Process each contest
         for contest_id in self.CONTEST_IDS:
-            # Get the results and problem count for the contest
-            results, problem_count = self.process_single(contest_id)
+            # Get the solve masks and problem labels for the contest
+            results, problem_labels = self.process_cached(contest_id)
             contest_results[contest_id] = results
-            contest_problem_counts.append(problem_count)
+            contest_problem_labels[contest_id] = problem_labels
+            contest_problem_counts.append(len(problem_labels))
             all_participants.update(results.keys())
         
         # Create the final results dictionary
@@ -167,15 +246,26 @@ class InformaticsParser():
             
             for contest_id in self.CONTEST_IDS:
                 # Get the participant's result for this contest, or 0 if they didn't participate
-                result = contest_results[contest_id].get(participant, 0)
+                result = SolveBitsets.popcount(contest_results[contest_id].get(participant, 0))
                 participant_results.append(result)
             
             final_results[participant_converted] = participant_results
         
+        # Transpose the row masks into per-problem bitsets over the cohort
+        bitsets = SolveBitsets(sorted(final_results), self.CONTEST_IDS)
+        for contest_id in self.CONTEST_IDS:
+            bitsets.add_contest(
+                contest_id,
+                contest_problem_labels[contest_id],
+                {InfromaticsNameConvert(name): mask for name, mask in contest_results[contest_id].items()},
+            )
+        
         self.logger.info(f"Processed {len(self.CONTEST_IDS)} contests with {len(final_results)} total participants")
         
         # Update the global data
         GlobalData().update_informatics_data(final_results)
         GlobalData().update_informatics_common_data(contest_problem_counts)
+        GlobalData().update_informatics_contest_ids(list(self.CONTEST_IDS))
+        GlobalData().update_informatics_bitsets(bitsets)
         
         return final_results
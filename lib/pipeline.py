@@ -0,0 +1,83 @@
+"""
+Pipeline stages shared by the web app and the command line.
+
+Every stage imports the modules it needs on first call, so running a single
+stage does not pay for the imports of the others. Set MEMORY_REPORT=1 to log
+the memory usage of every stage.
+"""
+from lib.profiling import memory_report, profiled
+
+
+@memory_report('reanimate')
+def reanimate():
+    from lib.fetchers.InformaticsSessionReanimator import InformaticsSessionReanimator
+    reanimators = [InformaticsSessionReanimator()]
+    for reanimator in reanimators:
+        reanimator.prepare()
+        reanimator.process()
+
+@profiled('fetch')
+@memory_report('fetch')
+def fetch_data():
+    from lib.deadline import Deadline
+    from lib.fetchers.InformaticsFetcher import InformaticsFetcher
+    from lib.fetchers.UsersFetcher import UsersFetcher
+    deadline = Deadline.for_fetch_cycle()
+    fetchers = [InformaticsFetcher(), UsersFetcher()]
+    for fetcher in fetchers:
+        fetcher.prepare()
+        fetcher.process(deadline)
+
+@profiled('parse')
+@memory_report('parse')
+def parse_data():
+    from lib.parsers.InformaticsParser import InformaticsParser
+    from lib.parsers.UsersParser import UsersParser
+    # InformaticsParser takes the roster from UsersParser
+    fetchers = [UsersParser(), InformaticsParser()]
+    for fetcher in fetchers:
+        fetcher.prepare()
+        fetcher.process()
+    publish_data()
+
+@memory_report('submissions')
+def ingest_submissions():
+    from lib.parsers.CodeforcesSubmissionsParser import CodeforcesSubmissionsParser
+    # Takes the handles parsed by UsersParser, the counts are published by the next parse
+    ingester = CodeforcesSubmissionsParser()
+    ingester.prepare()
+    ingester.process()
+
+@memory_report('publish')
+def publish_data():
+    from lib.publishers.LeaderboardPublisher import LeaderboardPublisher
+    from lib.publishers.StatsPublisher import StatsPublisher
+    # StatsPublisher summarizes the version published by LeaderboardPublisher
+    publishers = [LeaderboardPublisher(), StatsPublisher()]
+    for publisher in publishers:
+        if publisher.prepare():
+            publisher.process()
+
+@memory_report('render')
+def render_data(mode='full'):
+    from lib.renderer.renderer import Renderer
+    renderer = Renderer(mode)
+    renderer.prepare()
+    return renderer.process()
+
+def shadow_compare():
+    from lib.shadow import ShadowHarness
+    return ShadowHarness().process()
+
+def load_trends():
+    from lib.dumpers.TrendTracker import TrendTracker
+    TrendTracker().prepare()
+
+@profiled('dump')
+@memory_report('dump')
+def dump_data():
+    from lib.dumpers.Dumper import Dumper
+    dumpers = [Dumper()]
+    for dumper in dumpers:
+        dumper.prepare()
+        dumper.process()
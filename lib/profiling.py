@@ -0,0 +1,332 @@
+import os
+import sys
+import cProfile
+import logging
+import functools
+import threading
+import collections
+import tracemalloc
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def memory_report_enabled() -> bool:
+    return os.environ.get('MEMORY_REPORT', '').lower() in ('1', 'true', 'yes')
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of the process in KiB, 0 where unsupported."""
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (ImportError, AttributeError):
+        return 0
+
+
+class HeapTrace:
+    """
+    Context manager measuring the Python heap peak of a block with tracemalloc.
+
+    Traces can be nested and can run in several threads at once: tracemalloc
+    is started by the first active trace and stopped after the last one, and
+    before a trace resets the global peak, the peak so far is folded into all
+    other active traces, so an inner trace never hides the peak of an outer
+    one. tracemalloc is process-wide, so concurrent threads count towards the
+    peaks of all traces active at the time.
+    """
+    _lock = threading.Lock()
+    _active = set()
+    _started = False
+
+    def __init__(self):
+        self.before = 0
+        self.peak = 0
+        self.current = 0
+
+    def __enter__(self):
+        cls = type(self)
+        with cls._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                cls._started = True
+            _, peak = tracemalloc.get_traced_memory()
+            for trace in cls._active:
+                trace.peak = max(trace.peak, peak)
+            tracemalloc.reset_peak()
+            self.before, _ = tracemalloc.get_traced_memory()
+            self.peak = self.before
+            cls._active.add(self)
+        return self
+
+    def __exit__(self, *exc):
+        cls = type(self)
+        with cls._lock:
+            self.current, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            cls._active.discard(self)
+            if not cls._active and cls._started:
+                tracemalloc.stop()
+                cls._started = False
+
+    @property
+    def heap_peak_kib(self) -> float:
+        return (self.peak - self.before) / 1024
+
+    @property
+    def retained_kib(self) -> float:
+        return (self.current - self.before) / 1024
+
+
+def memory_report(stage):
+    """
+    Decorator that logs the Python heap usage of a pipeline stage.
+
+    When MEMORY_REPORT is set, the stage runs with tracemalloc enabled and the
+    report contains the heap peak during the stage, the heap growth left after
+    it and the process peak RSS. Without MEMORY_REPORT the stage runs untouched.
+
+    Args:
+        stage (str): Stage name used in the report
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not memory_report_enabled():
+                return func(*args, **kwargs)
+
+            trace = HeapTrace()
+            try:
+                with trace:
+                    return func(*args, **kwargs)
+            finally:
+                logger.info(
+                    f"Memory report [{stage}]: heap peak {trace.heap_peak_kib:.1f} KiB, "
+                    f"retained {trace.retained_kib:.1f} KiB, peak RSS {peak_rss_kb() / 1024:.1f} MiB"
+                )
+        return wrapper
+    return decorator
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for a single thread.
+
+    A background thread records the stack of the target thread every
+    interval and aggregates identical stacks. dump() writes them in the
+    folded format understood by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        own_file = __file__
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != own_file:
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def enable(self):
+        self.thread.start()
+
+    def disable(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def dump_stats(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class CycleProfiler:
+    """
+    Singleton that profiles the next pipeline cycle or a window of requests on demand.
+
+    An admin arms it for one target: a pipeline stage ('fetch', 'parse', 'dump')
+    or 'requests'. The next run of that stage, or the next N /ratings requests,
+    runs under cProfile ('deterministic', saved as .pstats) or SamplingProfiler
+    ('sampling', saved as folded stacks for flame graphs) and the profiler
+    disarms itself. While nothing is armed, the only cost is one attribute check.
+    """
+    _instance = None
+
+    TARGETS = ('fetch', 'parse', 'dump', 'requests')
+    KINDS = ('deterministic', 'sampling')
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CycleProfiler, cls).__new__(cls)
+            cls._instance.logger = logging.getLogger(__name__)
+            cls._instance.lock = threading.Lock()
+            cls._instance.armed = None
+            cls._instance.active = None
+            cls._instance.completed = []
+        return cls._instance
+
+    @property
+    def profiles_dir(self):
+        return os.path.join(os.environ.get('PROJECT_ROOT', ''), os.environ.get('PROFILES_DIR', 'raw/profiles'))
+
+    def arm(self, target, kind='deterministic', requests=100):
+        """
+        Arm the profiler for the next run of a target.
+
+        Args:
+            target (str): 'fetch', 'parse', 'dump' or 'requests'
+            kind (str): 'deterministic' or 'sampling'
+            requests (int): Number of /ratings requests to profile for the 'requests' target
+
+        Returns:
+            dict: The armed profile description
+
+        Raises:
+            ValueError: If the target or kind is unknown, or a profile is already armed or running
+        """
+        if target not in self.TARGETS:
+            raise ValueError(f"Unknown target '{target}', use one of {', '.join(self.TARGETS)}")
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown profiler '{kind}', use one of {', '.join(self.KINDS)}")
+        with self.lock:
+            if self.armed is not None or self.active is not None:
+                raise ValueError("A profile is already armed or running")
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            extension = 'pstats' if kind == 'deterministic' else 'folded'
+            self.armed = {
+                'target': target,
+                'kind': kind,
+                'requests': max(1, int(requests)),
+                'name': f"{target}_{timestamp}.{extension}",
+            }
+            self.logger.info(f"Armed {kind} profile for {target}")
+            return dict(self.armed)
+
+    def is_armed(self, target):
+        armed = self.armed
+        return armed is not None and armed['target'] == target
+
+    def start(self, target):
+        """
+        Start the armed profile in the current thread.
+
+        Returns:
+            bool: True if a profile was started
+        """
+        with self.lock:
+            if not self.is_armed(target) or self.active is not None:
+                return False
+            session, self.armed = self.armed, None
+            if session['kind'] == 'deterministic':
+                profiler = cProfile.Profile()
+            else:
+                profiler = SamplingProfiler(threading.get_ident())
+            session['profiler'] = profiler
+            session['remaining'] = session['requests']
+            self.active = session
+        profiler.enable()
+        return True
+
+    def is_active(self, target):
+        active = self.active
+        return active is not None and active['target'] == target
+
+    def request_done(self):
+        """Count a profiled request and finish the profile after the last one."""
+        with self.lock:
+            if self.active is None:
+                return
+            self.active['remaining'] -= 1
+            if self.active['remaining'] > 0:
+                return
+        self.finish()
+
+    def finish(self):
+        """Stop the running profile and save it to PROFILES_DIR."""
+        with self.lock:
+            session, self.active = self.active, None
+        if session is None:
+            return
+        session['profiler'].disable()
+        try:
+            os.makedirs(self.profiles_dir, exist_ok=True)
+            session['profiler'].dump_stats(os.path.join(self.profiles_dir, session['name']))
+            self.completed.append(session['name'])
+            self.logger.info(f"Saved {session['kind']} profile of {session['target']} to {session['name']}")
+        except Exception as e:
+            self.logger.error(f"Error saving profile {session['name']}: {str(e)}")
+
+    def status(self):
+        armed = self.armed
+        active = self.active
+        return {
+            'armed': {key: armed[key] for key in ('target', 'kind', 'requests', 'name')} if armed else None,
+            'running': {key: active[key] for key in ('target', 'kind', 'name')} if active else None,
+            'profiles': sorted(os.listdir(self.profiles_dir)) if os.path.isdir(self.profiles_dir) else [],
+        }
+
+    def profile_path(self, name):
+        """
+        Get the path of a saved profile.
+
+        Returns:
+            str: Absolute path or None if there is no such profile
+        """
+        if name != os.path.basename(name):
+            return None
+        path = os.path.join(self.profiles_dir, name)
+        return path if os.path.isfile(path) else None
+
+
+def profiled(stage):
+    """
+    Decorator that runs a pipeline stage under CycleProfiler when it is armed for the stage.
+
+    Args:
+        stage (str): Stage name, one of CycleProfiler.TARGETS
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = CycleProfiler()
+            if not profiler.is_armed(stage) or not profiler.start(stage):
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.finish()
+        return wrapper
+    return decorator
+
+
+class RequestProfilerMiddleware:
+    """
+    ASGI middleware that profiles a window of /ratings requests when CycleProfiler is armed for 'requests'.
+    """
+
+    def __init__(self, app, path_prefix='/ratings'):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        profiler = CycleProfiler()
+        if scope['type'] != 'http' or not (profiler.is_armed('requests') or profiler.is_active('requests')):
+            return await self.app(scope, receive, send)
+        if not scope['path'].startswith(self.path_prefix) or scope['path'].endswith('/stream'):
+            return await self.app(scope, receive, send)
+
+        profiler.start('requests')
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.request_done()
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+
+
+class _Slot:
+    """A single published message in the broadcast chain."""
+
+    __slots__ = ('event', 'message', 'next')
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.message = None
+        self.next = None
+
+
+class Broadcaster:
+    """
+    Singleton that fans published messages out to all connected stream clients.
+
+    Messages form a chain of slots. Every subscriber waits on the event of the
+    current tail slot, so an idle connection is a single awaiting coroutine and
+    a publish costs one event set regardless of the number of clients. Slots
+    that no subscriber references anymore are garbage collected.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Broadcaster, cls).__new__(cls)
+            cls._instance.loop = None
+            cls._instance.tail = None
+            cls._instance.published = 0
+            cls._instance.logger = logging.getLogger(__name__)
+        return cls._instance
+
+    def bind(self, loop):
+        """
+        Bind the broadcaster to the event loop that serves the stream clients.
+
+        Args:
+            loop: The running asyncio event loop
+        """
+        self.loop = loop
+        self.tail = _Slot()
+        self.logger.info("Broadcaster bound to event loop")
+
+    def publish(self, message):
+        """
+        Publish a message to all subscribers. Safe to call from any thread.
+
+        Args:
+            message (str): Pre-encoded message shared by all subscribers
+        """
+        if self.loop is None:
+            self.logger.debug("Broadcaster is not bound to an event loop, dropping message")
+            return
+        self.loop.call_soon_threadsafe(self._fire, message)
+
+    def _fire(self, message):
+        slot = self.tail
+        slot.message = message
+        slot.next = self.tail = _Slot()
+        self.published += 1
+        slot.event.set()
+
+    async def subscribe(self):
+        """
+        Yield every message published after the subscription started.
+        """
+        slot = self.tail
+        while True:
+            await slot.event.wait()
+            yield slot.message
+            slot = slot.next
@@ -0,0 +1,77 @@
+import json
+import logging
+from lib.global_data import GlobalData
+from lib.publishers.Broadcaster import Broadcaster
+from lib.renderer.renderer import Renderer
+
+
+class LeaderboardPublisher:
+    """
+    Class for publishing leaderboard changes to stream clients.
+
+    Renders the full leaderboard once per publish, compares it with the
+    previously published one, stores the result under a new version in
+    GlobalData and broadcasts only the changed entries.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.renderer = Renderer(mode='full')
+
+    def prepare(self):
+        """
+        Render the current leaderboard from GlobalData.
+
+        Returns:
+            bool: True if preparation was successful, False otherwise
+        """
+        return self.renderer.prepare()
+
+    @staticmethod
+    def diff(previous, current):
+        """
+        Compare two rendered leaderboards.
+
+        Returns:
+            dict: Dictionary with 'added' and 'changed' entries by handle and 'removed' handles
+        """
+        added = {}
+        changed = {}
+        for handle, entry in current.items():
+            if handle not in previous:
+                added[handle] = entry
+            elif previous[handle] != entry:
+                changed[handle] = entry
+        removed = [handle for handle in previous if handle not in current]
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    def process(self):
+        """
+        Publish a new leaderboard version and broadcast the entries that changed.
+
+        Returns:
+            dict: Dictionary with the 'version' and the 'added', 'changed' and 'removed' entries,
+                  or an empty dictionary if nothing changed
+        """
+        try:
+            current = self.renderer.process()
+            version, previous = GlobalData().get_published_ratings()
+            diff = self.diff(previous, current)
+
+            if not (diff['added'] or diff['changed'] or diff['removed']):
+                self.logger.info(f"No leaderboard changes since version {version}")
+                return {}
+
+            version = GlobalData().update_published_ratings(current, diff)
+            payload = {'version': version, **diff}
+            message = f"id: {version}\nevent: ratings\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+            Broadcaster().publish(message)
+
+            self.logger.info(
+                f"Published version {version}: {len(diff['added'])} added, "
+                f"{len(diff['changed'])} changed, {len(diff['removed'])} removed"
+            )
+            return payload
+        except Exception as e:
+            self.logger.error(f"Error publishing leaderboard: {str(e)}")
+            return {}
@@ -0,0 +1,140 @@
+import os
+import math
+import logging
+from lib.global_data import GlobalData
+
+
+class StatsPublisher:
+    """
+    Class for precomputing cohort statistics once per published leaderboard version.
+
+    The statistics cover the score and rating distributions (histograms and
+    percentile tables) of the published leaderboard and, for every informatics
+    contest, the participation of the roster and the solve rates computed from
+    the solve bitsets. They are stored in GlobalData, so /ratings/stats answers
+    from memory without touching the leaderboard.
+    """
+
+    PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.score_bin = int(os.environ.get('STATS_SCORE_BIN', 50))
+        self.rating_bin = int(os.environ.get('STATS_RATING_BIN', 100))
+        self.version = 0
+        self.entries = {}
+        self.bitsets = None
+
+    def prepare(self):
+        """
+        Take the published leaderboard and check whether the stats are outdated.
+
+        Returns:
+            bool: True if new stats have to be computed, False otherwise
+        """
+        self.version, self.entries = GlobalData().get_published_ratings()
+        self.bitsets = GlobalData().get_informatics_bitsets()
+        return GlobalData().get_ratings_stats_source() != self.source()
+
+    def source(self):
+        """Identity of the data the stats are computed from."""
+        return (self.version, id(self.bitsets))
+
+    @staticmethod
+    def percentile(sorted_values, p):
+        """Nearest-rank percentile of sorted values."""
+        if not sorted_values:
+            return 0
+        return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+    @classmethod
+    def distribution(cls, values, bin_width):
+        """
+        Summarize values with a fixed-width histogram and a percentile table.
+
+        Returns:
+            dict: Dictionary with 'count', 'mean', 'min', 'max', 'histogram' and 'percentiles'
+        """
+        values = sorted(values)
+        if not values:
+            return {'count': 0, 'mean': 0, 'min': 0, 'max': 0, 'histogram': [], 'percentiles': {}}
+
+        counts = {}
+        for value in values:
+            start = math.floor(value / bin_width) * bin_width
+            counts[start] = counts.get(start, 0) + 1
+        first, last = min(counts), max(counts)
+        histogram = []
+        start = first
+        while start <= last:
+            histogram.append({'from': start, 'to': start + bin_width, 'count': counts.get(start, 0)})
+            start += bin_width
+
+        return {
+            'count': len(values),
+            'mean': round(sum(values) / len(values), 1),
+            'min': values[0],
+            'max': values[-1],
+            'histogram': histogram,
+            'percentiles': {f'p{p}': cls.percentile(values, p) for p in cls.PERCENTILES},
+        }
+
+    def contest_summaries(self, names):
+        """
+        Summarize the informatics contests for the roster.
+
+        Args:
+            names (list): Informatics names of the roster participants
+
+        Returns:
+            list: Per-contest dictionaries with participation and solve rates
+        """
+        bitsets = self.bitsets
+        if bitsets is None:
+            return []
+
+        problem_counts = GlobalData().get_informatics_common_data()
+        cohort = bitsets.cohort_mask(names)
+        roster_size = len(self.entries)
+        summaries = []
+        for i, contest_id in enumerate(bitsets.contest_ids):
+            present = bitsets.present[contest_id] & cohort
+            participants = bitsets.popcount(present)
+            solves = sum(bitsets.popcount(column & present) for column in bitsets.columns[contest_id])
+            summaries.append({
+                'contest_id': contest_id,
+                'problems': problem_counts[i] if i < len(problem_counts) else len(bitsets.columns[contest_id]),
+                'participants': participants,
+                'participation_rate': round(participants / roster_size, 3) if roster_size else 0.0,
+                'average_solved': round(solves / participants, 2) if participants else 0.0,
+                'solve_rates': {
+                    label: round(rate, 3) for label, rate in bitsets.solve_rates(contest_id, cohort).items()
+                },
+            })
+        return summaries
+
+    def process(self):
+        """
+        Compute the statistics and store them in GlobalData.
+
+        Returns:
+            dict: The computed statistics
+        """
+        try:
+            users_data = GlobalData().get_users_data()
+            scores = [entry['score'] for entry in self.entries.values()]
+            ratings = [users_data.get(handle, {}).get('rating', 0) for handle in self.entries]
+            names = [entry['name'] for entry in self.entries.values()]
+
+            stats = {
+                'version': self.version,
+                'participants': len(self.entries),
+                'score': self.distribution(scores, self.score_bin),
+                'rating': self.distribution(ratings, self.rating_bin),
+                'contests': self.contest_summaries(names),
+            }
+            GlobalData().update_ratings_stats(stats, self.source())
+            return stats
+        except Exception as e:
+            self.logger.error(f"Error computing ratings stats: {str(e)}")
+            return {}
@@ -0,0 +1,231 @@
+import os
+import json
+import math
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+class CompiledScoring:
+    """
+    Scoring formula reduced to plain coefficients for one data snapshot.
+
+    cf_score = rating_coef * min(rating, rating_cap)
+    informatics_score = sum(contest_coefs[i] * solved[i])
+    score = cf_score + informatics_score
+    """
+
+    def __init__(self, rating_coef: float, rating_cap: float, contest_coefs: List[float], total_solved_coef: float = 0.0):
+        self.rating_coef = rating_coef
+        self.rating_cap = rating_cap
+        self.contest_coefs = contest_coefs
+        self.total_solved_coef = total_solved_coef  # Average coefficient per problem, for totals without a contest split
+
+    def evaluate_all(self, ratings: List[int], solved: List[List[int]]) -> List[Tuple[float, float]]:
+        """
+        Evaluate the formula for all participants at once.
+
+        Args:
+            ratings: Codeforces ratings of the participants
+            solved: Solved problem counts per contest for each participant
+
+        Returns:
+            list: (cf_score, informatics_score) for each participant
+        """
+        rating_coef = self.rating_coef
+        rating_cap = self.rating_cap
+        coefs = self.contest_coefs
+        return [
+            (rating_coef * min(rating, rating_cap), sum((coef * count for coef, count in zip(coefs, row)), 0.0))
+            for rating, row in zip(ratings, solved)
+        ]
+
+    def evaluate_total(self, rating: float, total_solved: float) -> float:
+        """
+        Evaluate the formula for a total solved count without the per-contest split,
+        as stored in old snapshots. Exact while all contests have the same weight.
+
+        Returns:
+            float: The score
+        """
+        return self.rating_coef * min(rating, self.rating_cap) + self.total_solved_coef * total_solved
+
+
+class ScoringEngine:
+    """
+    Singleton that loads the scoring formula from config and compiles it once per snapshot.
+
+    The config is a JSON file at SCORING_CONFIG (relative to PROJECT_ROOT):
+    {
+        "rating": {"weight": 500, "max": 2000, "cap": null},
+        "solved": {"weight": 500, "half_life_days": null},
+        "contests": {"102456": {"weight": 1.0, "date": "2025-01-10"}}
+    }
+
+    The rating part is weight * min(rating, cap) / max. The solved part is
+    weight * sum(w_i * solved_i) / sum(w_i * problems_i), where w_i is the
+    contest weight multiplied by 0.5 ** (age_days / half_life_days) when a
+    half-life and the contest date are set. Without a config file the
+    formula is 500 * (rating / 2000 + solved / MAX_SOLVED).
+    """
+    _instance = None
+
+    DEFAULT_CONFIG = {
+        'rating': {'weight': 500, 'max': 2000, 'cap': None},
+        'solved': {'weight': 500, 'half_life_days': None},
+        'contests': {},
+    }
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ScoringEngine, cls).__new__(cls)
+            cls._instance.logger = logging.getLogger(__name__)
+            cls._instance.config = cls.DEFAULT_CONFIG
+            cls._instance.config_signature = None
+            cls._instance.config_generation = 0
+            cls._instance.compiled_key = None
+            cls._instance.compiled_scoring = None
+        return cls._instance
+
+    def _config_path(self) -> Optional[str]:
+        config_path = os.environ.get('SCORING_CONFIG')
+        if not config_path:
+            return None
+        return os.path.join(os.environ.get('PROJECT_ROOT', ''), config_path)
+
+    def load_config(self) -> Dict:
+        """
+        Reload the config if the file changed since the last call.
+
+        Returns:
+            dict: The current valid config. An invalid file keeps the previous config.
+        """
+        config_path = self._config_path()
+        try:
+            stat = os.stat(config_path) if config_path else None
+        except OSError:
+            stat = None
+        signature = (config_path, stat.st_mtime_ns, stat.st_size) if stat else None
+        if signature == self.config_signature:
+            return self.config
+
+        self.config_signature = signature
+        self.config_generation += 1
+        if signature is None:
+            self.config = self.DEFAULT_CONFIG
+            return self.config
+
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                self.config = self.validate(json.load(f))
+            self.logger.info(f"Loaded scoring config from {config_path}")
+        except Exception as e:
+            self.logger.error(f"Invalid scoring config {config_path}, keeping the previous one: {str(e)}")
+        return self.config
+
+    @classmethod
+    def validate(cls, raw: Dict) -> Dict:
+        """
+        Validate a raw config and fill in the defaults.
+
+        Raises:
+            ValueError: If the config has unknown keys or invalid values
+        """
+        if not isinstance(raw, dict):
+            raise ValueError("config must be an object")
+        unknown = set(raw) - set(cls.DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"unknown sections: {sorted(unknown)}")
+
+        def section(name):
+            value = raw.get(name, {})
+            if not isinstance(value, dict):
+                raise ValueError(f"'{name}' must be an object")
+            unknown = set(value) - set(cls.DEFAULT_CONFIG[name])
+            if unknown:
+                raise ValueError(f"unknown keys in '{name}': {sorted(unknown)}")
+            return {**cls.DEFAULT_CONFIG[name], **value}
+
+        def number(value, field, allow_none=False):
+            if value is None and allow_none:
+                return None
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"'{field}' must be a non-negative number")
+            return float(value)
+
+        rating = section('rating')
+        solved = section('solved')
+        config = {
+            'rating': {
+                'weight': number(rating['weight'], 'rating.weight'),
+                'max': number(rating['max'], 'rating.max'),
+                'cap': number(rating['cap'], 'rating.cap', allow_none=True),
+            },
+            'solved': {
+                'weight': number(solved['weight'], 'solved.weight'),
+                'half_life_days': number(solved['half_life_days'], 'solved.half_life_days', allow_none=True),
+            },
+            'contests': {},
+        }
+        if config['rating']['max'] == 0:
+            raise ValueError("'rating.max' must be positive")
+        if config['solved']['half_life_days'] == 0:
+            raise ValueError("'solved.half_life_days' must be positive")
+
+        contests = raw.get('contests', {})
+        if not isinstance(contests, dict):
+            raise ValueError("'contests' must be an object")
+        for contest_id, contest in contests.items():
+            if not isinstance(contest, dict) or set(contest) - {'weight', 'date'}:
+                raise ValueError(f"contest {contest_id} must be an object with 'weight' and 'date'")
+            contest_date = contest.get('date')
+            config['contests'][str(contest_id)] = {
+                'weight': number(contest.get('weight', 1.0), f'contests.{contest_id}.weight'),
+                'date': date.fromisoformat(contest_date) if contest_date else None,
+            }
+        return config
+
+    def compile(self, contest_ids: List[str], problem_counts: List[int], today: Optional[date] = None) -> CompiledScoring:
+        """
+        Get the formula compiled for the given contests, reusing it while config and data are unchanged.
+
+        Args:
+            contest_ids: Contest IDs in the order of the solved counts
+            problem_counts: Number of problems in each contest
+            today: Date used for contest age decay
+
+        Returns:
+            CompiledScoring: The compiled formula
+        """
+        config = self.load_config()
+        today = today or date.today()
+        key = (self.config_generation, tuple(contest_ids), tuple(problem_counts), today)
+        if key == self.compiled_key:
+            return self.compiled_scoring
+
+        rating = config['rating']
+        solved = config['solved']
+        half_life = solved['half_life_days']
+
+        contest_weights = []
+        for contest_id in contest_ids:
+            contest = config['contests'].get(contest_id, {'weight': 1.0, 'date': None})
+            weight = contest['weight']
+            if half_life and contest['date']:
+                age = max((today - contest['date']).days, 0)
+                weight *= 0.5 ** (age / half_life)
+            contest_weights.append(weight)
+
+        total = sum(weight * count for weight, count in zip(contest_weights, problem_counts))
+        contest_coefs = [solved['weight'] * weight / total if total > 0 else 0.0 for weight in contest_weights]
+
+        self.compiled_scoring = CompiledScoring(
+            rating_coef=rating['weight'] / rating['max'],
+            rating_cap=rating['cap'] if rating['cap'] is not None else math.inf,
+            contest_coefs=contest_coefs,
+            # sum(contest_coefs[i] * problem_counts[i]) is the solved weight
+            total_solved_coef=solved['weight'] / sum(problem_counts) if total > 0 and sum(problem_counts) > 0 else 0.0,
+        )
+        self.compiled_key = key
+        self.logger.info(f"Compiled scoring formula for {len(contest_ids)} contests")
+        return self.compiled_scoring
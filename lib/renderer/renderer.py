@@ -1,5 +1,6 @@
 import logging
 from lib.global_data import GlobalData
+from lib.renderer.ScoringEngine import ScoringEngine
 from typing import Dict, List, Any, Union
 
 class Renderer:
@@ -10,7 +11,8 @@ class Renderer:
     def __init__(self, mode='short'):
         self.logger = logging.getLogger(__name__)
         self.participants_data = {}
-        self.MAX_RATING = 2000  # Maximum rating to normalize by
+        self.solved_by_contest = {}  # Solved counts per contest for each handle
+        self.scoring = None     # Compiled by ScoringEngine in prepare()
         self.MAX_SOLVED = 0     # Will be calculated from global_data
         self.mode = mode
     
@@ -41,6 +43,9 @@ class Renderer:
             self.MAX_SOLVED = sum(informatics_common_data) if informatics_common_data else 1
             self.logger.info(f"Total number of problems (MAX_SOLVED): {self.MAX_SOLVED}")
             
+            # Get the scoring formula compiled for the current contests
+            self.scoring = ScoringEngine().compile(GlobalData().get_informatics_contest_ids(), informatics_common_data)
+            
             if not users_data:
                 self.logger.warning("No users data available in GlobalData")
                 return False
@@ -54,6 +59,7 @@ class Renderer:
             
             # Merge data and create participants_data
             self.participants_data = {}
+            self.solved_by_contest = {}
             
             # First, add all users from users_data
             for handle, data in users_data.items():
@@ -62,6 +68,7 @@ class Renderer:
                 
                 # Find solved problems from informatics_data if available
                 solved = 0
+                self.solved_by_contest[handle] = informatics_data.get(name, [])
                 if name in informatics_data:
                     # Sum all solved problems across all contests
                     solved = sum(informatics_data[name])
@@ -79,6 +86,20 @@ class Renderer:
             self.logger.error(f"Error preparing renderer data: {str(e)}")
             return False
         
+    def compute_scores(self):
+        """
+        Evaluate the compiled formula for all prepared participants at once.
+        
+        Returns:
+            dict: Dictionary mapping handles to (cf_score, informatics_score)
+        """
+        handles = list(self.participants_data)
+        scores = self.scoring.evaluate_all(
+            [self.participants_data[handle].get("rating", 0) for handle in handles],
+            [self.solved_by_contest.get(handle, []) for handle in handles],
+        )
+        return dict(zip(handles, scores))
+        
     def process_web(self):
         result = {}
         try:
@@ -86,20 +107,19 @@ class Renderer:
                 self.logger.warning("No participants data available. Call prepare() first.")
                 return {}
             
-            for handle, data in self.participants_data.items():
-                name = data.get("name", "")
-                rating = data.get("rating", 0)
-                solved = data.get("solved", 0)
-                
-                # Calculate score using the new formula
-                normalized_rating = rating / self.MAX_RATING
-                normalized_solved = solved / self.MAX_SOLVED if self.MAX_SOLVED > 0 else 0
-                score = 500 * (normalized_rating + normalized_solved)
+            trends = GlobalData().get_trends() if self.mode == 'full' else {}
+            codeforces_solved = GlobalData().get_codeforces_solved() if self.mode == 'full' else {}
+            
+            for handle, (cf_score, informatics_score) in self.compute_scores().items():
+                name = self.participants_data[handle].get("name", "")
+                score = cf_score + informatics_score
                 
                 if self.mode == 'short':
                     result[handle] = [name, round(score)]
                 elif self.mode == 'full':
-                    result[handle] = {'name': name, 'cf_score': round(500 * normalized_rating, 1), 'informatics_score': round(500 * normalized_solved, 1), 'score': round(score)}
+                    result[handle] = {'name': name, 'cf_score': round(cf_score, 1), 'informatics_score': round(informatics_score, 1), 'score': round(score)}
+                    result[handle]['cf_solved'] = codeforces_solved.get(handle, 0)
+                    result[handle].update(trends.get(handle, {}))
             
             self.logger.info(f"Processed scores for {len(result)} participants")
             return result
@@ -117,11 +137,10 @@ class Renderer:
             handle: [name, score]
         }
         
-        Score is calculated as:
-        500 * (rating / MAX_RATING + solved / MAX_SOLVED)
+        Score is calculated by the formula compiled by ScoringEngine, by default:
+        500 * (rating / 2000 + solved / MAX_SOLVED)
         
         Where:
-        - MAX_RATING = 2000
         - MAX_SOLVED = total number of problems across all contests
         
         Returns:
@@ -0,0 +1,170 @@
+import os
+import json
+import base64
+import hashlib
+import logging
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+
+def cassette_key(method, path, query):
+    """
+    Build a host-independent key of an HTTP exchange.
+
+    Args:
+        method (str): HTTP method
+        path (str): URL path
+        query (str): Raw query string
+
+    Returns:
+        str: Hex digest identifying the exchange
+    """
+    normalized_query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    raw = f"{method.upper()} {path.rstrip('/') or '/'}?{normalized_query}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class HttpRecorder:
+    """
+    Singleton that records real HTTP exchanges to a cassette directory.
+
+    Recording is enabled by setting HTTP_RECORD_DIR. Every response that passes
+    through an attached session is stored as one JSON file named by
+    cassette_key(), so ReplayServer can serve it back without network.
+    Request bodies and cookies are never stored.
+    """
+    _instance = None
+
+    STORED_HEADERS = ('Content-Type', 'Cache-Control', 'ETag', 'Last-Modified')
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HttpRecorder, cls).__new__(cls)
+            cls._instance.logger = logging.getLogger(__name__)
+            cls._instance.record_dir = os.environ.get('HTTP_RECORD_DIR')
+            if cls._instance.record_dir:
+                os.makedirs(cls._instance.record_dir, exist_ok=True)
+                cls._instance.logger.info(f"Recording HTTP exchanges to {cls._instance.record_dir}")
+        return cls._instance
+
+    @property
+    def enabled(self):
+        return bool(self.record_dir)
+
+    def attach(self, session):
+        """
+        Record every response of a requests-compatible session.
+
+        Args:
+            session: requests.Session or cloudscraper session
+        """
+        if self.enabled:
+            session.hooks['response'].append(self.record)
+        return session
+
+    def cassette_path(self, response):
+        """Path of the cassette of a response."""
+        url = urlsplit(response.request.url)
+        return os.path.join(self.record_dir, f"{cassette_key(response.request.method, url.path, url.query)}.json")
+
+    def cassette(self, response):
+        """Cassette fields of a response except the body."""
+        url = urlsplit(response.request.url)
+        return {
+            'method': response.request.method,
+            'path': url.path,
+            'query': url.query,
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers},
+        }
+
+    def record(self, response, *args, **kwargs):
+        """
+        Response hook that writes the exchange to the cassette directory.
+
+        Streamed responses are skipped: reading their content here would load
+        the whole body into memory, so stream_to_file records them chunk by
+        chunk through stream_writer().
+        """
+        if kwargs.get('stream'):
+            return response
+        try:
+            cassette = self.cassette(response)
+            cassette['body'] = base64.b64encode(response.content).decode('ascii')
+            with open(self.cassette_path(response), 'w', encoding='utf-8') as f:
+                json.dump(cassette, f)
+        except Exception as e:
+            self.logger.error(f"Error recording HTTP exchange: {str(e)}")
+        return response
+
+    def stream_writer(self, response):
+        """
+        Cassette writer for a streamed response.
+
+        Args:
+            response: requests.Response obtained with stream=True
+
+        Returns:
+            CassetteWriter: Writer fed with the raw body chunks, or None if recording is off
+        """
+        if not self.enabled:
+            return None
+        try:
+            return CassetteWriter(self.cassette_path(response), self.cassette(response))
+        except Exception as e:
+            self.logger.error(f"Error recording HTTP exchange: {str(e)}")
+            return None
+
+
+class CassetteWriter:
+    """
+    Writes a cassette whose body arrives in chunks.
+
+    The body is base64-encoded on the fly into a .part file, so only one chunk
+    is held in memory. The cassette appears under its final name on close();
+    after abort() or a failed write nothing is left behind. Recording errors
+    are logged and never interrupt the download.
+    """
+
+    def __init__(self, path, cassette):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.part_path = path + '.part'
+        self.pending = b''
+        self.file = open(self.part_path, 'w', encoding='utf-8')
+        # The header is the cassette without its closing brace, the body string follows
+        self.file.write(json.dumps(cassette)[:-1] + ', "body": "')
+
+    def write(self, chunk):
+        """Append raw body bytes."""
+        if self.file is None:
+            return
+        try:
+            data = self.pending + chunk
+            # Encode whole 3-byte groups only, so the pieces concatenate into valid base64
+            split = len(data) - len(data) % 3
+            self.pending = data[split:]
+            self.file.write(base64.b64encode(data[:split]).decode('ascii'))
+        except Exception as e:
+            self.logger.error(f"Error recording HTTP exchange: {str(e)}")
+            self.abort()
+
+    def close(self):
+        """Finish the cassette and move it into place."""
+        if self.file is None:
+            return
+        try:
+            self.file.write(base64.b64encode(self.pending).decode('ascii') + '"}')
+            self.file.close()
+            self.file = None
+            os.replace(self.part_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Error recording HTTP exchange: {str(e)}")
+            self.abort()
+
+    def abort(self):
+        """Drop the partially written cassette."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
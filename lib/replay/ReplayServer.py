@@ -0,0 +1,274 @@
+"""
+Local stand-in for informatics.msk.ru, the users spreadsheet and the Codeforces API.
+
+Serves recorded cassettes from HttpRecorder first and falls back to synthetic
+responses: the login form and login result, py/monitor pages from the stored
+contest files, a roster CSV built from the names in those files, user.info
+with deterministic ratings and user.status with deterministic submissions. Latency, errors and rate limits are configurable,
+so the whole pipeline can be run and load-tested without network:
+
+    python -m lib.replay.ReplayServer --port 8765 --latency-ms 50 --error-rate 0.05 --rate-limit 20
+
+    INFORMATICS_URL=http://127.0.0.1:8765/
+    CODEFORCES_API_URL=http://127.0.0.1:8765/api
+    USERS_SPREADSHEET_URL=http://127.0.0.1:8765/spreadsheets/d/replay/export?format=csv
+"""
+import os
+import re
+import csv
+import io
+import json
+import time
+import base64
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from lib.replay.HttpRecorder import cassette_key
+
+NAME_PATTERN = re.compile(r'<a href="/submits/view\.php\?user_id=\d+">([^<]+)</a>')
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server imitating the external services used by the fetchers.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, cassette_dir=None, contests_dir=None, roster_path=None,
+                 latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=0.0):
+        self.logger = logging.getLogger(__name__)
+        self.cassette_dir = cassette_dir
+        self.contests_dir = contests_dir
+        self.roster_path = roster_path
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.tokens = rate_limit
+        self.refilled_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'cassettes': 0, 'synthetic': 0, 'errors': 0, 'throttled': 0}
+
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                replay.handle(self, 'GET')
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.rfile.read(length)
+                replay.handle(self, 'POST')
+
+            def log_message(self, format, *args):
+                replay.logger.debug(format % args)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def serve_forever(self):
+        self.logger.info(f"Replay server listening on {self.url}")
+        self.httpd.serve_forever()
+
+    def start(self):
+        """Serve in a background thread, returns self."""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _take_token(self):
+        if self.rate_limit <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.refilled_at) * self.rate_limit)
+            self.refilled_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def handle(self, handler, method):
+        url = urlsplit(handler.path)
+        with self.lock:
+            self.stats['requests'] += 1
+
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        if not self._take_token():
+            self._count('throttled')
+            return self.send(handler, 429, b'Too Many Requests', {'Retry-After': '1'})
+        if self.error_rate and random.random() < self.error_rate:
+            self._count('errors')
+            return self.send(handler, 500, b'Internal Server Error')
+
+        cassette = self.load_cassette(method, url.path, url.query)
+        if cassette is not None:
+            self._count('cassettes')
+            return self.send(handler, cassette['status'], base64.b64decode(cassette['body']), cassette['headers'])
+
+        response = self.synthesize(method, url.path, parse_qs(url.query))
+        if response is None:
+            return self.send(handler, 404, b'Not Found')
+        self._count('synthetic')
+        status, body, content_type = response
+        return self.send(handler, status, body, {'Content-Type': content_type})
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def send(handler, status, body, headers=None):
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def load_cassette(self, method, path, query):
+        if not self.cassette_dir:
+            return None
+        cassette_path = os.path.join(self.cassette_dir, f"{cassette_key(method, path, query)}.json")
+        if not os.path.exists(cassette_path):
+            return None
+        with open(cassette_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def synthesize(self, method, path, params):
+        """
+        Build a synthetic response.
+
+        Returns:
+            tuple: (status, body, content type) or None if the path is unknown
+        """
+        html = 'text/html; charset=utf-8'
+        if path.endswith('/login/index.php'):
+            if method == 'POST':
+                return 200, 'Вы зашли под именем replay'.encode('utf-8'), html
+            form = (
+                '<form id="login" action="/login/index.php" method="post">'
+                '<input type="hidden" name="logintoken" value="replay">'
+                '<input type="text" name="username"><input type="password" name="password">'
+                '</form>'
+            )
+            return 200, form.encode('utf-8'), html
+
+        if path.endswith('/py/monitor'):
+            contest_id = params.get('contest_id', [''])[0]
+            contest_path = self.contest_path(contest_id)
+            if contest_path is None:
+                return None
+            with open(contest_path, 'rb') as f:
+                return 200, f.read(), html
+
+        if path.endswith('/user.info'):
+            handles = [handle for handle in params.get('handles', [''])[0].split(';') if handle]
+            result = [{'handle': handle, 'rating': self.synthetic_rating(handle)} for handle in handles]
+            return 200, json.dumps({'status': 'OK', 'result': result}).encode('utf-8'), 'application/json'
+
+        if path.endswith('/user.status'):
+            handle = params.get('handle', [''])[0]
+            start = int(params.get('from', ['1'])[0])
+            count = int(params.get('count', ['0'])[0]) or None
+            submissions = self.synthetic_submissions(handle)
+            result = submissions[start - 1:start - 1 + count if count else None]
+            return 200, json.dumps({'status': 'OK', 'result': result}).encode('utf-8'), 'application/json'
+
+        if path.endswith('/export'):
+            return 200, self.roster_csv(), 'text/csv; charset=utf-8'
+
+        return None
+
+    def contest_path(self, contest_id):
+        if not self.contests_dir or not contest_id.isdigit():
+            return None
+        contest_path = os.path.join(self.contests_dir, f'contest_{contest_id}')
+        return contest_path if os.path.exists(contest_path) else None
+
+    @staticmethod
+    def synthetic_rating(handle):
+        return 800 + int(hashlib.sha1(handle.encode('utf-8')).hexdigest(), 16) % 1800
+
+    @staticmethod
+    def synthetic_submissions(handle):
+        """Submissions of a handle, newest first, growing by one every minute."""
+        seed = int(hashlib.sha1(handle.encode('utf-8')).hexdigest(), 16)
+        total = seed % 300 + int(time.time() // 60) % 1000
+        rng = random.Random(seed)
+        submissions = []
+        for number in range(1, total + 1):
+            submissions.append({
+                'id': seed % 100000 * 10000 + number,
+                'problem': {'contestId': 1000 + rng.randrange(500), 'index': rng.choice('ABCDEF')},
+                'verdict': 'OK' if rng.random() < 0.6 else 'WRONG_ANSWER',
+            })
+        submissions.reverse()
+        return submissions
+
+    def roster_csv(self):
+        """Roster CSV from roster_path, or one built from the names in the stored contest files."""
+        if self.roster_path:
+            with open(self.roster_path, 'rb') as f:
+                return f.read()
+
+        names = set()
+        if self.contests_dir and os.path.isdir(self.contests_dir):
+            for filename in os.listdir(self.contests_dir):
+                if filename.startswith('contest_'):
+                    with open(os.path.join(self.contests_dir, filename), 'r', encoding='utf-8') as f:
+                        names.update(name.strip() for name in NAME_PATTERN.findall(f.read()))
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Timestamp', 'Name', 'Handle'])
+        for i, name in enumerate(sorted(names)):
+            writer.writerow(['', name, f'replay_{i}'])
+        return output.getvalue().encode('utf-8')
+
+
+def main():
+    project_root = os.environ.get('PROJECT_ROOT', os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    parser = argparse.ArgumentParser(description="Local replay server for informatics, the users spreadsheet and Codeforces")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cassettes', default=os.environ.get('HTTP_RECORD_DIR'), help="Cassette directory written by HttpRecorder")
+    parser.add_argument('--contests', default=os.path.join(project_root, os.environ.get('INFORMATICS_DIR', 'raw/informatics')))
+    parser.add_argument('--roster', default=None, help="CSV served as the users spreadsheet export")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument('--rate-limit', type=float, default=0.0, help="Requests per second before answering 429, 0 to disable")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = ReplayServer(
+        args.host, args.port, args.cassettes, args.contests, args.roster,
+        args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.logger.info(f"Replay server stats: {server.stats}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Shadow mode: run alternative pipeline engines next to the production ones and compare.
+
+An engine is a class with the prepare()/process() interface of the stage it
+replaces, given as "module:Class":
+
+    SHADOW_USERS_ENGINE=lib.parsers.FastUsersParser:FastUsersParser
+    SHADOW_INFORMATICS_ENGINE=lib.parsers.FastInformaticsParser:FastInformaticsParser
+    SHADOW_RENDER_ENGINE=lib.renderer.FastRenderer:FastRenderer
+
+Stages without a shadow engine run the production engine on both sides.
+"""
+import os
+import json
+import time
+import logging
+import importlib
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from lib.global_data import GlobalData
+from lib.profiling import HeapTrace
+
+STAGES = ['users', 'informatics', 'render']
+
+PRODUCTION_ENGINES = {
+    'users': 'lib.parsers.UsersParser:UsersParser',
+    'informatics': 'lib.parsers.InformaticsParser:InformaticsParser',
+    'render': 'lib.renderer.renderer:Renderer',
+}
+
+
+def load_engine(path):
+    """
+    Import an engine class.
+
+    Args:
+        path (str): "module:Class"
+
+    Raises:
+        ValueError: If the path is malformed or the class cannot be imported
+    """
+    module_name, _, class_name = path.partition(':')
+    if not module_name or not class_name:
+        raise ValueError(f"Engine must be given as 'module:Class', got '{path}'")
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot load engine '{path}': {str(e)}")
+
+
+def diff_mappings(production, shadow, limit):
+    """
+    Compare two dictionaries key by key.
+
+    Args:
+        production (dict): Output of the production engines
+        shadow (dict): Output of the shadow engines
+        limit (int): Maximum number of keys listed per kind of difference
+
+    Returns:
+        dict: Counts and examples of keys missing on either side and of changed values
+    """
+    only_production = [key for key in production if key not in shadow]
+    only_shadow = [key for key in shadow if key not in production]
+    changed = [key for key in production if key in shadow and production[key] != shadow[key]]
+    return {
+        'match': not (only_production or only_shadow or changed),
+        'only_production': {'count': len(only_production), 'keys': only_production[:limit]},
+        'only_shadow': {'count': len(only_shadow), 'keys': only_shadow[:limit]},
+        'changed': {
+            'count': len(changed),
+            'examples': {key: {'production': production[key], 'shadow': shadow[key]} for key in changed[:limit]},
+        },
+    }
+
+
+class ShadowHarness:
+    """
+    Singleton running the users, informatics and render stages with the production
+    and the shadow engines and comparing their results.
+
+    Both sides run in the calling thread inside GlobalData.sandbox(), starting
+    from the current global data and reading the same fetched files, so the
+    published data is never modified and no request waits for the comparison.
+    Every stage is timed. With SHADOW_TRACE_MEMORY=1 its Python heap peak is
+    also measured with tracemalloc; this is off by default because tracing
+    slows down every thread of the process, including the one serving
+    requests, while the comparison runs. The report with timings, speedups and
+    the differences in users_data, informatics_data and rendered scores is
+    kept in memory and written to SHADOW_REPORT_DIR.
+
+    Codeforces ratings are requested by both sides, so a rating that changes
+    between the two requests shows up as a users_data difference.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ShadowHarness, cls).__new__(cls)
+            cls._instance.logger = logging.getLogger(__name__)
+            cls._instance.lock = threading.Lock()
+            cls._instance.last_report = None
+        return cls._instance
+
+    @staticmethod
+    def shadow_engines():
+        """Shadow engine paths configured by SHADOW_<STAGE>_ENGINE."""
+        return {
+            stage: os.environ[f'SHADOW_{stage.upper()}_ENGINE']
+            for stage in STAGES if os.environ.get(f'SHADOW_{stage.upper()}_ENGINE')
+        }
+
+    def enabled(self):
+        return bool(self.shadow_engines())
+
+    @property
+    def report_dir(self):
+        return os.path.join(os.environ.get('PROJECT_ROOT', ''), os.environ.get('SHADOW_REPORT_DIR', 'raw/shadow'))
+
+    def run_stage(self, stage, engine_class, trace_memory):
+        """
+        Run one stage in the current sandbox.
+
+        Returns:
+            tuple: (dict: 'seconds', 'ok' and, when tracing, 'heap_peak_kib'; stage output)
+        """
+        trace = HeapTrace() if trace_memory else nullcontext()
+        with trace:
+            started = time.perf_counter()
+            engine = engine_class('full') if stage == 'render' else engine_class()
+            ok = engine.prepare() is not False
+            output = engine.process() if ok else None
+            seconds = time.perf_counter() - started
+        metrics = {'seconds': round(seconds, 4), 'ok': ok}
+        if trace_memory:
+            metrics['heap_peak_kib'] = round(trace.heap_peak_kib, 1)
+        return metrics, output
+
+    def run_side(self, engines, trace_memory):
+        """
+        Run all stages with the given engines on a private copy of the global data.
+
+        Returns:
+            tuple: (dict: stage metrics, dict: users_data, informatics_data and rendered scores)
+        """
+        metrics = {}
+        with GlobalData.sandbox() as data:
+            rendered = {}
+            for stage in STAGES:
+                metrics[stage], output = self.run_stage(stage, load_engine(engines[stage]), trace_memory)
+                if stage == 'render':
+                    rendered = output or {}
+            outputs = {
+                'users_data': data.get_users_data(),
+                'informatics_data': data.get_informatics_data(),
+                'scores': {
+                    handle: [entry.get('cf_score'), entry.get('informatics_score'), entry.get('score')]
+                    for handle, entry in rendered.items()
+                },
+            }
+        return metrics, outputs
+
+    def process(self):
+        """
+        Run both sides, compare them and save the report.
+
+        Returns:
+            dict: The report, or an empty dictionary if shadow mode is off or a comparison is already running
+        """
+        shadow_engines = self.shadow_engines()
+        if not shadow_engines:
+            return {}
+        if not self.lock.acquire(blocking=False):
+            self.logger.warning("Shadow comparison is already running, skipping")
+            return {}
+
+        trace_memory = os.environ.get('SHADOW_TRACE_MEMORY', '').lower() in ('1', 'true', 'yes')
+        try:
+            engines = {'production': dict(PRODUCTION_ENGINES), 'shadow': {**PRODUCTION_ENGINES, **shadow_engines}}
+            started_at = datetime.now()
+            production_metrics, production = self.run_side(engines['production'], trace_memory)
+            shadow_metrics, shadow = self.run_side(engines['shadow'], trace_memory)
+
+            limit = int(os.environ.get('SHADOW_DIFF_LIMIT', 20))
+            diffs = {name: diff_mappings(production[name], shadow[name], limit) for name in production}
+            stages = {}
+            for stage in STAGES:
+                production_seconds = production_metrics[stage]['seconds']
+                shadow_seconds = shadow_metrics[stage]['seconds']
+                stages[stage] = {
+                    'production': production_metrics[stage],
+                    'shadow': shadow_metrics[stage],
+                    'speedup': round(production_seconds / shadow_seconds, 2) if shadow_seconds else None,
+                }
+
+            report = {
+                'started_at': started_at.isoformat(timespec='seconds'),
+                'engines': {stage: {side: engines[side][stage] for side in engines} for stage in STAGES},
+                'stages': stages,
+                'diffs': diffs,
+                'parity': all(diff['match'] for diff in diffs.values()),
+            }
+            self.last_report = report
+            self.save(report, started_at)
+
+            summary = ', '.join(f"{stage} x{stages[stage]['speedup']}" for stage in STAGES)
+            if report['parity']:
+                self.logger.info(f"Shadow engines match production ({summary})")
+            else:
+                mismatched = [name for name, diff in diffs.items() if not diff['match']]
+                self.logger.warning(f"Shadow engines differ from production in {', '.join(mismatched)} ({summary})")
+            return report
+        except Exception as e:
+            self.logger.error(f"Error running shadow comparison: {str(e)}")
+            return {}
+        finally:
+            self.lock.release()
+
+    def save(self, report, started_at):
+        """Write the report to SHADOW_REPORT_DIR."""
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            path = os.path.join(self.report_dir, f"shadow_{started_at.strftime('%Y-%m-%d_%H-%M-%S')}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            self.logger.error(f"Error saving shadow report: {str(e)}")
@@ -0,0 +1,156 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+
+class SolveBitsets:
+    """
+    Compact per-problem solve bitsets for a cohort of informatics participants.
+
+    Every participant gets a fixed bit position. For each contest and each problem
+    the class keeps a single integer whose bit j is set if participant j solved the
+    problem, plus an integer with the bits of everybody present in the contest table.
+    Cohort queries are then answered with bitwise operations instead of re-parsing HTML.
+    """
+
+    def __init__(self, participants: List[str], contest_ids: List[str]):
+        """
+        Initialize empty bitsets.
+
+        Args:
+            participants: Participant names, the position in the list is the bit index
+            contest_ids: Contest IDs in the order used by GlobalData
+        """
+        self.participants = list(participants)
+        self.index = {name: i for i, name in enumerate(self.participants)}
+        self.contest_ids = list(contest_ids)
+        self.problem_labels: Dict[str, List[str]] = {id: [] for id in self.contest_ids}
+        self.columns: Dict[str, List[int]] = {id: [] for id in self.contest_ids}
+        self.present: Dict[str, int] = {id: 0 for id in self.contest_ids}
+
+    @staticmethod
+    def _from_positions(positions: Iterable[int], size: int) -> int:
+        """Build an integer with the given bit positions set in O(size)."""
+        buffer = bytearray((size + 7) // 8)
+        for position in positions:
+            buffer[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(buffer, 'little')
+
+    @staticmethod
+    def popcount(value: int) -> int:
+        return bin(value).count('1')
+
+    def add_contest(self, contest_id: str, problem_labels: List[str], row_masks: Dict[str, int]):
+        """
+        Transpose per-participant row masks of one contest into per-problem columns.
+
+        Args:
+            contest_id: Contest ID
+            problem_labels: Problem labels from the table header ('A', 'B', ...)
+            row_masks: Dictionary mapping participant names to masks where bit i means problem i is solved
+        """
+        size = len(self.participants)
+        solvers = [[] for _ in problem_labels]
+        present = []
+        for name, mask in row_masks.items():
+            position = self.index.get(name)
+            if position is None:
+                continue
+            present.append(position)
+            problem = 0
+            while mask:
+                if mask & 1 and problem < len(solvers):
+                    solvers[problem].append(position)
+                mask >>= 1
+                problem += 1
+
+        self.problem_labels[contest_id] = list(problem_labels)
+        self.columns[contest_id] = [self._from_positions(positions, size) for positions in solvers]
+        self.present[contest_id] = self._from_positions(present, size)
+
+    def cohort_mask(self, names: Optional[Iterable[str]] = None) -> int:
+        """
+        Get the bitset of a group of participants.
+
+        Args:
+            names: Participant names, or None for everybody
+
+        Returns:
+            int: Bitset with the bits of the known participants set
+        """
+        if names is None:
+            return (1 << len(self.participants)) - 1
+        return self._from_positions(
+            (self.index[name] for name in names if name in self.index),
+            len(self.participants),
+        )
+
+    def names(self, mask: int) -> List[str]:
+        """Decode a bitset into participant names."""
+        result = []
+        position = 0
+        while mask:
+            if mask & 1:
+                result.append(self.participants[position])
+            mask >>= 1
+            position += 1
+        return result
+
+    def _problem_index(self, contest_id: str, problem: Union[int, str]) -> int:
+        if isinstance(problem, int):
+            return problem
+        return self.problem_labels[contest_id].index(problem)
+
+    def solved_mask(self, contest_id: str, problem: Union[int, str], cohort: Optional[int] = None) -> int:
+        """Bitset of participants that solved a problem, optionally limited to a cohort bitset."""
+        column = self.columns[contest_id][self._problem_index(contest_id, problem)]
+        return column if cohort is None else column & cohort
+
+    def solvers(self, contest_id: str, problem: Union[int, str], cohort: Optional[int] = None) -> List[str]:
+        """
+        Get participants who solved a problem.
+
+        Args:
+            contest_id: Contest ID
+            problem: Problem index or label
+            cohort: Optional cohort bitset from cohort_mask()
+
+        Returns:
+            list: Names of the participants who solved the problem
+        """
+        return self.names(self.solved_mask(contest_id, problem, cohort))
+
+    def unsolved_problems(self, contest_id: str, cohort: Optional[int] = None) -> List[str]:
+        """
+        Get problems of a contest that nobody in the cohort solved.
+
+        Returns:
+            list: Labels of the unsolved problems
+        """
+        labels = self.problem_labels[contest_id]
+        return [
+            labels[i] for i, column in enumerate(self.columns[contest_id])
+            if not (column if cohort is None else column & cohort)
+        ]
+
+    def solve_rates(self, contest_id: str, cohort: Optional[int] = None) -> Dict[str, float]:
+        """
+        Get the share of contest participants in the cohort who solved each problem.
+
+        Returns:
+            dict: Dictionary mapping problem labels to solve rates in [0, 1]
+        """
+        present = self.present[contest_id] if cohort is None else self.present[contest_id] & cohort
+        total = self.popcount(present)
+        return {
+            label: (self.popcount(column & present) / total if total else 0.0)
+            for label, column in zip(self.problem_labels[contest_id], self.columns[contest_id])
+        }
+
+    def solved_problems(self, name: str, contest_id: str) -> List[str]:
+        """Get the labels of problems a participant solved in a contest."""
+        position = self.index.get(name)
+        if position is None:
+            return []
+        return [
+            label for label, column in zip(self.problem_labels[contest_id], self.columns[contest_id])
+            if column >> position & 1
+        ]
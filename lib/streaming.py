@@ -0,0 +1,58 @@
+import codecs
+import hashlib
+from lib.replay.HttpRecorder import HttpRecorder
+
+CHUNK_SIZE = 64 * 1024
+
+
+def stream_to_file(response, path, deadline=None, encoding=None):
+    """
+    Write a streamed response body to a file chunk by chunk.
+
+    Only one chunk is held in memory at a time. The body is hashed on the fly,
+    and the deadline is checked between chunks, so a slowly dripping body
+    cannot outlive the fetch cycle. When HTTP recording is on, the raw chunks
+    are also written to the cassette of the response as they arrive.
+
+    Args:
+        response: requests.Response obtained with stream=True
+        path (str): Destination file
+        deadline (Deadline): Optional budget of the fetch cycle
+        encoding (str): If set, the body is decoded from this encoding and written as UTF-8
+
+    Returns:
+        dict: Dictionary with 'size' in bytes and 'sha1' of the written content
+
+    Raises:
+        TimeoutError: If the deadline expires while streaming
+    """
+    digest = hashlib.sha1()
+    size = 0
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace') if encoding else None
+    cassette = HttpRecorder().stream_writer(response)
+
+    try:
+        with open(path, 'wb') as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if deadline is not None and deadline.expired:
+                    raise TimeoutError("Fetch cycle deadline expired while streaming the response")
+                if cassette:
+                    cassette.write(chunk)
+                if decoder:
+                    chunk = decoder.decode(chunk).encode('utf-8')
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+            if decoder:
+                tail = decoder.decode(b'', final=True).encode('utf-8')
+                digest.update(tail)
+                size += len(tail)
+                f.write(tail)
+    except BaseException:
+        if cassette:
+            cassette.abort()
+        raise
+    if cassette:
+        cassette.close()
+
+    return {'size': size, 'sha1': digest.hexdigest()}
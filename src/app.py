@@ -1,15 +1,18 @@
 import uvicorn
 import os
-from fastapi import FastAPI, Query
+import hmac
+from fastapi import FastAPI, Query, Header, HTTPException
+from fastapi.responses import StreamingResponse, FileResponse
 from typing import Dict, List, Optional, Union, Any
 import asyncio
-from lib.fetchers.InformaticsFetcher import InformaticsFetcher
-from lib.fetchers.InformaticsSessionReanimator import InformaticsSessionReanimator
-from lib.fetchers.UsersFetcher import UsersFetcher
-from lib.parsers.InformaticsParser import InformaticsParser
-from lib.parsers.UsersParser import UsersParser
+from datetime import datetime
+from lib.pipeline import reanimate, fetch_data, parse_data, publish_data, dump_data, load_trends, shadow_compare, ingest_submissions
 from lib.renderer.renderer import Renderer
-from lib.dumpers.Dumper import Dumper
+from lib.global_data import GlobalData
+from lib.publishers.Broadcaster import Broadcaster
+from lib.exporters.Exporter import Exporter
+from lib.profiling import CycleProfiler, RequestProfilerMiddleware
+from lib.shadow import ShadowHarness
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import logging
 from dotenv import load_dotenv
@@ -26,6 +29,9 @@ FETCH_INTERVAL_MINUTES = int(os.getenv("FETCH_INTERVAL_MINUTES"))
 PARSE_INTERVAL_MINUTES = int(os.getenv("PARSE_INTERVAL_MINUTES"))
 DUMP_INTERVAL_MINUTES = int(os.getenv("DUMP_INTERVAL_MINUTES"))
 
+# Set to 0 to serve only the data loaded into GlobalData by the embedding process
+PIPELINE_ENABLED = os.getenv("PIPELINE_ENABLED", "1") != "0"
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,31 +40,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Algosy Ratings API")
-
-
-def reanimate():
-    reanimators = [InformaticsSessionReanimator()]
-    for reanimator in reanimators:
-        reanimator.prepare()
-        reanimator.process()
-
-def fetch_data():
-    fetchers = [InformaticsFetcher(), UsersFetcher()]
-    for fetcher in fetchers:
-        fetcher.prepare()
-        fetcher.process()
-
-def parse_data():
-    fetchers = [InformaticsParser(), UsersParser()]
-    for fetcher in fetchers:
-        fetcher.prepare()
-        fetcher.process()
-
-def dump_data():
-    dumpers = [Dumper()]
-    for dumper in dumpers:
-        dumper.prepare()
-        dumper.process()
+app.add_middleware(RequestProfilerMiddleware)
 
 
 @app.on_event("startup")
@@ -66,9 +48,17 @@ async def startup_event():
     """
     Initialize data and start the scheduler on application startup.
     """
+    Broadcaster().bind(asyncio.get_running_loop())
+    if not PIPELINE_ENABLED:
+        logger.info("Pipeline disabled, serving preloaded data only")
+        return
+    
     reanimate()
     fetch_data()
     parse_data()
+    # Backfilling trends rescores old snapshots, which needs the parsed contests
+    load_trends()
+    publish_data()
     
     # Set up scheduler to download CSV and update data based on environment settings
     scheduler = AsyncIOScheduler()
@@ -76,23 +66,57 @@ async def startup_event():
     scheduler.add_job(fetch_data, 'interval', minutes=FETCH_INTERVAL_MINUTES)
     scheduler.add_job(parse_data, 'interval', minutes=PARSE_INTERVAL_MINUTES)
     scheduler.add_job(dump_data, 'interval', minutes=DUMP_INTERVAL_MINUTES)
+    # Codeforces submissions are ingested in their own job, starting right away in a worker thread
+    scheduler.add_job(
+        ingest_submissions, 'interval', next_run_time=datetime.now(),
+        minutes=int(os.getenv("CF_SUBMISSIONS_INTERVAL_MINUTES", FETCH_INTERVAL_MINUTES)),
+    )
+    if ShadowHarness().enabled():
+        # Compare the shadow engines after parse jobs, in the scheduler's worker threads
+        scheduler.add_job(shadow_compare, 'interval', minutes=int(os.getenv("SHADOW_INTERVAL_MINUTES", PARSE_INTERVAL_MINUTES)))
     scheduler.start()
     logger.info(f"Scheduler started - will fetch data every {FETCH_INTERVAL_MINUTES} minutes and parse data every {PARSE_INTERVAL_MINUTES} minutes")
 
+def render_entries(entries, mode):
+    """
+    Convert published full-mode entries to the requested response mode.
+    """
+    if mode == 'short':
+        return {handle: [entry['name'], entry['score']] for handle, entry in entries.items()}
+    return entries
+
 @app.get("/ratings")
 async def get_participant_ratings(
     type: str = Query(None, description="Struct of response format"),
-    mode: str = Query('short', description="Mode of response format")
+    mode: str = Query('short', description="Mode of response format"),
+    since: Optional[int] = Query(None, description="Return only entries changed after this version")
 ):
     """
     Get ratings for all participants.
     
     Query Parameters:
     - type: If set to 'list', returns data in {handle: [name, rating]} format
+    - since: If set, returns {version, full, added, changed, removed} with the entries
+      changed after that version, or {version, full, entries} with the whole
+      leaderboard if the version has aged out of the history buffer or was
+      issued by a previous process
     
     Returns:
         JSON with participant data sorted by rating (descending)
     """
+    if type == "list" and since is not None:
+        delta = GlobalData().get_ratings_since(since)
+        if delta is None:
+            version, entries = GlobalData().get_published_ratings()
+            return {"version": version, "full": True, "entries": render_entries(entries, mode)}
+        return {
+            "version": delta["version"],
+            "full": False,
+            "added": render_entries(delta["added"], mode),
+            "changed": render_entries(delta["changed"], mode),
+            "removed": delta["removed"],
+        }
+    
     if type == "list":
         renderer = Renderer(mode)
         renderer.prepare()
@@ -103,5 +127,130 @@ async def get_participant_ratings(
     # Default response if type is not 'list'
     return {"error": "Invalid type parameter. Use '?type=list'"}
 
+@app.get("/ratings/status")
+async def get_ratings_status():
+    """
+    Get the state of the published data.
+    
+    Returns:
+        JSON with the published version and the contests that missed the last
+        fetch cycle and are served from previously stored standings
+    """
+    version, _ = GlobalData().get_published_ratings()
+    return {"version": version, "stale_contests": GlobalData().get_stale_contests()}
+
+@app.get("/ratings/stats")
+async def get_ratings_stats():
+    """
+    Get cohort statistics of the published leaderboard.
+    
+    Returns:
+        JSON with the version, score and rating histograms and percentiles, and
+        per-contest participation and solve rates, precomputed once per publish
+    """
+    stats = GlobalData().get_ratings_stats()
+    if not stats:
+        raise HTTPException(status_code=503, detail="Statistics are not computed yet")
+    return stats
+
+@app.get("/ratings/stream")
+async def stream_participant_ratings():
+    """
+    Stream leaderboard changes as Server-Sent Events.
+    
+    Every publish sends one 'ratings' event, with the published version as its id,
+    carrying the full-mode entries that were added or changed since the previous
+    publish and the handles that were removed.
+    
+    Returns:
+        text/event-stream response
+    """
+    return StreamingResponse(
+        Broadcaster().subscribe(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/export")
+async def export_ratings(
+    format: str = Query('ndjson', description="Export format: ndjson, csv or arrow")
+):
+    """
+    Stream the merged dataset: handle, name, rating, per-contest solves and scores.
+    
+    Query Parameters:
+    - format: 'ndjson' (default), 'csv' or 'arrow' (Arrow IPC stream, requires pyarrow)
+    
+    Returns:
+        Chunked response in the requested format
+    """
+    exporter = Exporter(format)
+    if not exporter.prepare():
+        return {"error": "Invalid format parameter. Use 'ndjson', 'csv' or 'arrow' (requires pyarrow)"}
+    
+    return StreamingResponse(
+        exporter.process(),
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": f"attachment; filename=ratings.{format}"},
+    )
+
+def check_admin_token(token):
+    """
+    Check the admin token against ADMIN_TOKEN. Admin endpoints are disabled while it is not set.
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected or not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@app.post("/admin/profile")
+async def arm_profile(
+    target: str = Query(..., description="Stage to profile: fetch, parse, dump or requests"),
+    profiler: str = Query('deterministic', description="Profiler: deterministic (pstats) or sampling (folded stacks)"),
+    requests: int = Query(100, description="Number of /ratings requests to profile for target=requests"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Profile the next run of a pipeline stage or the next /ratings requests.
+    
+    Returns:
+        JSON with the armed profile and the name of the file it will be saved to
+    """
+    check_admin_token(x_admin_token)
+    try:
+        return CycleProfiler().arm(target, profiler, requests)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/admin/profile")
+async def get_profile_status(x_admin_token: Optional[str] = Header(None)):
+    """
+    Get the armed and running profiles and the list of saved profiles.
+    """
+    check_admin_token(x_admin_token)
+    return CycleProfiler().status()
+
+@app.get("/admin/profile/{name}")
+async def download_profile(name: str, x_admin_token: Optional[str] = Header(None)):
+    """
+    Download a saved profile: .pstats for pstats/snakeviz, .folded for flamegraph.pl/speedscope.
+    """
+    check_admin_token(x_admin_token)
+    path = CycleProfiler().profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
+@app.get("/admin/shadow")
+async def get_shadow_report(x_admin_token: Optional[str] = Header(None)):
+    """
+    Get the last shadow mode report: per-stage timing and memory of the production and
+    shadow engines and the differences in users_data, informatics_data and rendered scores.
+    """
+    check_admin_token(x_admin_token)
+    report = ShadowHarness().last_report
+    if report is None:
+        raise HTTPException(status_code=404, detail="No shadow report yet")
+    return report
+
 if __name__ == "__main__":
     uvicorn.run("src.app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Headless entry point that runs pipeline stages without the web app.
+
+    python -m src.cli fetch parse dump
+    python -m src.cli parse render --mode short --output ratings.json
+    SHADOW_INFORMATICS_ENGINE=module:Class python -m src.cli fetch shadow
+
+Stages run in the given order in one process, sharing GlobalData, and each
+stage imports only the modules it needs. Stage timings are printed to stderr.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from dotenv import load_dotenv
+
+STAGES = ['reanimate', 'fetch', 'parse', 'submissions', 'render', 'dump', 'shadow']
+
+
+def run_stage(stage, args):
+    from lib import pipeline
+    if stage == 'reanimate':
+        pipeline.reanimate()
+    elif stage == 'fetch':
+        pipeline.fetch_data()
+    elif stage == 'parse':
+        pipeline.parse_data()
+    elif stage == 'submissions':
+        pipeline.ingest_submissions()
+    elif stage in ('render', 'shadow'):
+        data = pipeline.render_data(args.mode) if stage == 'render' else pipeline.shadow_compare()
+        output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            json.dump(data, output, ensure_ascii=False, indent=2)
+            output.write('\n')
+        finally:
+            if args.output:
+                output.close()
+    elif stage == 'dump':
+        pipeline.dump_data()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Algosy Ratings pipeline stages")
+    parser.add_argument('stages', nargs='+', choices=STAGES, help="Stages to run, in order")
+    parser.add_argument('--mode', default='full', choices=['short', 'full'], help="Render mode")
+    parser.add_argument('--output', default=None, help="File for the render or shadow report output, stdout by default")
+    parser.add_argument('--verbose', action='store_true', help="Show pipeline logs")
+    parser.add_argument('--memory', action='store_true', help="Log a tracemalloc memory report per stage")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if args.memory:
+        os.environ['MEMORY_REPORT'] = '1'
+        logging.getLogger('lib.profiling').setLevel(logging.INFO)
+
+    timings = []
+    for stage in args.stages:
+        started = time.perf_counter()
+        run_stage(stage, args)
+        timings.append((stage, time.perf_counter() - started))
+
+    for stage, elapsed in timings:
+        print(f"{stage:<10} {elapsed * 1000:10.1f} ms", file=sys.stderr)
+    print(f"{'total':<10} {sum(elapsed for _, elapsed in timings) * 1000:10.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
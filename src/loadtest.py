@@ -0,0 +1,272 @@
+"""
+HTTP load test for /ratings against a local instance loaded with synthetic data.
+
+    python -m src.loadtest run --participants 2000 --contests 12 --concurrency 32 --duration 15 --mix short=3,full=1
+    python -m src.loadtest run --url http://127.0.0.1:8000 --concurrency 16
+
+'run' starts a local server twice: once idle and once with a parse job
+re-parsing the synthetic contests in a loop, the way the scheduler runs
+parse_data in a worker thread. Both phases are driven with the same request
+mix and reported side by side, so event-loop blocking by parsing shows up in
+the latency percentiles. With --url only the given instance is measured.
+
+'serve' runs the synthetic instance alone and is what 'run' starts.
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import defaultdict
+
+FIRST_NAMES = ['Алексей', 'Мария', 'Иван', 'Полина', 'Дмитрий', 'Анна', 'Сергей', 'Елена', 'Павел', 'Ольга']
+LAST_NAMES = ['Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов', 'Новиков', 'Федоров']
+
+
+def synthetic_names(count):
+    return [f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {i}" for i in range(count)]
+
+
+def write_contest(path, names, problems):
+    """Write a py/monitor-like standings page with random results."""
+    rows = []
+    for position, name in enumerate(names, start=1):
+        cells = ''.join(
+            f"<td>{random.choice(['+', '+1', '-2', ''])}</td>" for _ in range(problems)
+        )
+        rows.append(f'<tr><td>{position}</td><td><a href="/submits/view.php?user_id={position}">{name}</a></td><td>0</td>{cells}</tr>')
+    header = ''.join(f'<td><a href="#">{chr(ord("A") + i)}</a></td>' for i in range(problems))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'<table class="BlueTable"><tr><td>N</td><td>Name</td><td>Sum</td>{header}</tr>{"".join(rows)}</table>')
+
+
+def load_synthetic_data(root, participants, contests, problems, outsiders):
+    """
+    Generate synthetic contest files and a roster and load them into GlobalData.
+    """
+    from lib.global_data import GlobalData
+    from lib.parsers.InformaticsParser import InformaticsParser
+    from lib.pipeline import publish_data
+
+    names = synthetic_names(participants)
+    informatics_dir = os.path.join(root, 'informatics')
+    os.makedirs(informatics_dir, exist_ok=True)
+    contest_ids = [str(100000 + i) for i in range(contests)]
+    for contest_id in contest_ids:
+        crowd = random.sample(names, k=max(1, participants * 3 // 4)) + synthetic_names(outsiders)
+        write_contest(os.path.join(informatics_dir, f'contest_{contest_id}'), crowd, problems)
+
+    os.environ.update({
+        'PROJECT_ROOT': root,
+        'INFORMATICS_DIR': 'informatics',
+        'INFORMATICS_CONTEST_IDS': ','.join(contest_ids),
+        'BANNED_NAMES': '',
+    })
+    GlobalData().update_users_data({
+        f"user_{i}": {"name": name, "rating": random.randint(800, 2600)} for i, name in enumerate(names)
+    })
+    parser = InformaticsParser()
+    parser.prepare()
+    parser.process()
+    publish_data()
+
+
+def parse_loop(stop_event):
+    """Re-parse all synthetic contests back to back, like a long parse_data job."""
+    from lib.global_data import GlobalData
+    from lib.parsers.InformaticsParser import InformaticsParser
+    from lib.pipeline import publish_data
+
+    while not stop_event.is_set():
+        GlobalData().get_informatics_parse_cache().clear()
+        parser = InformaticsParser()
+        parser.prepare()
+        parser.process()
+        publish_data()
+
+
+def serve(args):
+    import uvicorn
+
+    os.environ.setdefault('PIPELINE_ENABLED', '0')
+    for name in ('REANIMATE_INTERVAL_MINUTES', 'FETCH_INTERVAL_MINUTES', 'PARSE_INTERVAL_MINUTES', 'DUMP_INTERVAL_MINUTES'):
+        os.environ.setdefault(name, '60')
+    logging.basicConfig(level=logging.WARNING)
+
+    root = tempfile.mkdtemp(prefix='algosy-loadtest-')
+    try:
+        random.seed(args.seed)
+        load_synthetic_data(root, args.participants, args.contests, args.problems, args.outsiders)
+        if args.parse_loop:
+            threading.Thread(target=parse_loop, args=(threading.Event(),), daemon=True).start()
+
+        from src.app import app
+        uvicorn.run(app, host='127.0.0.1', port=args.port, log_level='warning', access_log=False)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(','):
+        mode, _, weight = part.partition('=')
+        if mode not in ('short', 'full'):
+            raise ValueError(f"Unknown mode '{mode}' in --mix")
+        weights[mode] = float(weight or 1)
+    return weights
+
+
+def drive(url, concurrency, duration, weights):
+    """
+    Drive /ratings with concurrent keep-alive clients.
+
+    Returns:
+        tuple: (dict: mode to sorted latencies in seconds, int: errors, float: elapsed seconds)
+    """
+    import requests
+
+    modes = list(weights)
+    mode_weights = [weights[mode] for mode in modes]
+    latencies = defaultdict(list)
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        session = requests.Session()
+        local = defaultdict(list)
+        local_errors = 0
+        while time.perf_counter() < stop_at:
+            mode = random.choices(modes, mode_weights)[0]
+            started = time.perf_counter()
+            try:
+                response = session.get(f"{url}/ratings", params={'type': 'list', 'mode': mode}, timeout=30)
+                response.content
+                if response.status_code != 200:
+                    local_errors += 1
+                    continue
+            except Exception:
+                local_errors += 1
+                continue
+            local[mode].append(time.perf_counter() - started)
+        with lock:
+            for mode, values in local.items():
+                latencies[mode].extend(values)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {mode: sorted(values) for mode, values in latencies.items()}, errors[0], elapsed
+
+
+def report(title, latencies, errors, elapsed, slo_ms):
+    print(f"\n{title}")
+    print(f"{'mode':<8} {'requests':>9} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    everything = sorted(value for values in latencies.values() for value in values)
+    for mode, values in list(sorted(latencies.items())) + [('all', everything)]:
+        print(
+            f"{mode:<8} {len(values):>9} {len(values) / elapsed:>9.1f} "
+            + ' '.join(f"{percentile(values, p) * 1000:>9.1f}" for p in (50, 95, 99))
+            + f" {(values[-1] if values else 0) * 1000:>9.1f}"
+        )
+    p99 = percentile(everything, 99) * 1000
+    verdict = 'OK' if p99 <= slo_ms else 'VIOLATED'
+    print(f"errors: {errors}, p99 SLO {slo_ms:.0f} ms: {verdict}")
+
+
+def wait_ready(url, process, timeout=120):
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("Load test server exited during startup")
+        try:
+            if requests.get(f"{url}/ratings/status", timeout=1).status_code == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Load test server did not start in time")
+
+
+def run(args):
+    weights = parse_mix(args.mix)
+    if args.url:
+        wait_ready(args.url, None)
+        report(f"{args.url}", *drive(args.url, args.concurrency, args.duration, weights), args.slo_ms)
+        return
+
+    phases = [('idle', False), ('parse job running', True)]
+    for title, parse in phases:
+        command = [
+            sys.executable, '-m', 'src.loadtest', 'serve',
+            '--port', str(args.port), '--participants', str(args.participants),
+            '--contests', str(args.contests), '--problems', str(args.problems),
+            '--outsiders', str(args.outsiders), '--seed', str(args.seed),
+        ] + (['--parse-loop'] if parse else [])
+        process = subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        url = f"http://127.0.0.1:{args.port}"
+        try:
+            wait_ready(url, process)
+            latencies, errors, elapsed = drive(url, args.concurrency, args.duration, weights)
+        finally:
+            process.terminate()
+            process.wait()
+        report(
+            f"{title}: {args.participants} participants, {args.contests} contests, "
+            f"concurrency {args.concurrency}, {args.duration:.0f} s",
+            latencies, errors, elapsed, args.slo_ms,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test /ratings with synthetic data")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def data_arguments(subparser):
+        subparser.add_argument('--port', type=int, default=8100)
+        subparser.add_argument('--participants', type=int, default=2000, help="Roster size")
+        subparser.add_argument('--contests', type=int, default=10)
+        subparser.add_argument('--problems', type=int, default=8, help="Problems per contest")
+        subparser.add_argument('--outsiders', type=int, default=3000, help="Non-roster rows per contest")
+        subparser.add_argument('--seed', type=int, default=1)
+
+    serve_parser = subparsers.add_parser('serve', help="Serve synthetic data")
+    data_arguments(serve_parser)
+    serve_parser.add_argument('--parse-loop', action='store_true', help="Re-parse the contests continuously")
+
+    run_parser = subparsers.add_parser('run', help="Run the load test")
+    data_arguments(run_parser)
+    run_parser.add_argument('--url', default=None, help="Measure an already running instance instead")
+    run_parser.add_argument('--concurrency', type=int, default=16)
+    run_parser.add_argument('--duration', type=float, default=10, help="Seconds per phase")
+    run_parser.add_argument('--mix', default='short=1,full=1', help="Request mix, e.g. short=3,full=1")
+    run_parser.add_argument('--slo-ms', type=float, default=200, help="p99 latency objective")
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        serve(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()